@@ -0,0 +1,433 @@
+# ASCII Runner - Vectorized Batch Engine
+# Runs many headless games in lockstep with NumPy for difficulty tuning and
+# autopilot training. Gameplay rules come from game_engine; this module only
+# re-expresses GameEngine.simulate_frame(cosmetic=False) over struct-of-arrays.
+
+import random
+
+import numpy as np
+
+from game_engine import (
+    SCREEN_COLS, GROUND_HEIGHT, MAX_JUMPS, BASE_SCROLL_SPEED, SPEED_PROGRESSION,
+    GRAVITY, JUMP_FORCE, FLAT_TOP_OBSTACLES, ORGANIC_OBSTACLES,
+    POWERUP_TYPES, POWERUP_PISTOL, POWERUP_JETPACK, POWERUP_BEANS, POWERUP_ACID, POWERUP_STOPWATCH,
+    INPUT_JUMP, INPUT_FIRE, Obstacle, Powerup, Player, pick_obstacle_type, obstacle_spawn_delay,
+)
+
+OBSTACLE_TYPES = ["easy", "bird", "cow", "house", "cactus", "spike"]
+OBSTACLE_CODES = {name: code for code, name in enumerate(OBSTACLE_TYPES)}
+POWERUP_CODES = {name: code for code, name in enumerate(POWERUP_TYPES)}
+
+# Per-type lookup tables indexed by obstacle code
+IS_ORGANIC = np.array([name in ORGANIC_OBSTACLES for name in OBSTACLE_TYPES])
+IS_FLAT_TOP = np.array([name in FLAT_TOP_OBSTACLES for name in OBSTACLE_TYPES])
+
+# Fixed slot capacities per lane - enough for any reachable game state
+MAX_OBSTACLES = 16
+MAX_POWERUPS = 16
+MAX_BULLETS = 32
+
+# Player constants (Player.x / width / height never change)
+PLAYER_X = Player().x
+PLAYER_WIDTH = Player().width
+PLAYER_HEIGHT = Player().height
+PLAYER_GROUND_Y = GROUND_HEIGHT - PLAYER_HEIGHT
+
+BULLET_SPEED = 3
+POWERUP_WIDTH = 3
+POWERUP_HEIGHT = 1
+
+
+class BatchGameEngine:
+    """Many GameEngine games advanced together, one lane per game.
+
+    Lane i with seed s reproduces, frame for frame, GameEngine(seed=s) stepped
+    with the same inputs - both draw gameplay randomness from random.Random(s). Random draws only
+    happen on spawns and bean farts, so those run per lane in Python; all
+    physics, movement, culling and collisions are vectorized across lanes."""
+
+    def __init__(self, num_lanes, seed=0, auto_reset=True):
+        self.num_lanes = num_lanes
+        self.auto_reset = auto_reset
+        self.next_seed = seed
+        self.high_score = np.zeros(num_lanes, dtype=np.int64)
+        self._alloc()
+        self.reset_lanes(np.arange(num_lanes))
+
+    def _alloc(self):
+        n = self.num_lanes
+        self.seeds = np.zeros(n, dtype=np.int64)
+        self.rngs = [None] * n
+        self.frame = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.done = np.zeros(n, dtype=bool)  # Lanes that died on the last step
+        self.death_type = np.full(n, -1, dtype=np.int8)  # Obstacle code that ended the run
+        self.spawn_timer = np.zeros(n, dtype=np.int64)
+        self.powerup_timer = np.zeros(n, dtype=np.int64)
+        self.scroll_speed = np.zeros(n)
+        self.stopwatch_timer = np.zeros(n, dtype=np.int64)
+        self.stopwatch_speed_reduction = np.zeros(n)
+
+        # Player physics and timers
+        self.y = np.zeros(n)
+        self.vel_y = np.zeros(n)
+        self.jumps_left = np.zeros(n, dtype=np.int64)
+        self.on_ground = np.zeros(n, dtype=bool)
+        self.jetpack_jumps = np.zeros(n, dtype=np.int64)
+        self.has_beans = np.zeros(n, dtype=bool)
+        self.beans_timer = np.zeros(n, dtype=np.int64)
+        self.ammo = np.zeros(n, dtype=np.int64)
+        self.acid_timer = np.zeros(n, dtype=np.int64)
+        self.was_in_nirvana = np.zeros(n, dtype=bool)
+        self.grace_period = np.zeros(n, dtype=np.int64)
+
+        # Obstacles, powerups and bullets - slots [0, count) are live, in spawn order
+        self.obs_count = np.zeros(n, dtype=np.int64)
+        self.obs_x = np.zeros((n, MAX_OBSTACLES))
+        self.obs_y = np.zeros((n, MAX_OBSTACLES))
+        self.obs_fly_y = np.zeros((n, MAX_OBSTACLES))
+        self.obs_width = np.zeros((n, MAX_OBSTACLES), dtype=np.int64)
+        self.obs_height = np.zeros((n, MAX_OBSTACLES), dtype=np.int64)
+        self.obs_type = np.zeros((n, MAX_OBSTACLES), dtype=np.int8)
+        self.obs_flying = np.zeros((n, MAX_OBSTACLES), dtype=bool)
+        self.obs_alive = np.zeros((n, MAX_OBSTACLES), dtype=bool)
+
+        self.pow_count = np.zeros(n, dtype=np.int64)
+        self.pow_x = np.zeros((n, MAX_POWERUPS))
+        self.pow_y = np.zeros((n, MAX_POWERUPS))
+        self.pow_type = np.zeros((n, MAX_POWERUPS), dtype=np.int8)
+
+        self.bullet_count = np.zeros(n, dtype=np.int64)
+        self.bullet_x = np.zeros((n, MAX_BULLETS))
+        self.bullet_y = np.zeros((n, MAX_BULLETS))
+
+        # Aggregated events per lane for the current run
+        self.jumps = np.zeros(n, dtype=np.int64)
+        self.shots = np.zeros(n, dtype=np.int64)
+        self.farts = np.zeros(n, dtype=np.int64)
+        self.stomps = np.zeros(n, dtype=np.int64)
+        self.collected = np.zeros((n, len(POWERUP_TYPES)), dtype=np.int64)
+
+    def reset_lanes(self, lanes, seeds=None):
+        """Start fresh games in the given lanes, taking the next seeds unless given"""
+        lanes = np.asarray(lanes, dtype=np.int64)
+        if seeds is None:
+            seeds = np.arange(self.next_seed, self.next_seed + len(lanes))
+            self.next_seed += len(lanes)
+        for lane, seed in zip(lanes.tolist(), np.asarray(seeds).tolist()):
+            self.rngs[lane] = random.Random(seed)
+        self.seeds[lanes] = seeds
+
+        self.frame[lanes] = 0
+        self.score[lanes] = 0
+        self.game_over[lanes] = False
+        self.done[lanes] = False
+        self.death_type[lanes] = -1
+        self.spawn_timer[lanes] = 180
+        self.powerup_timer[lanes] = 120
+        self.scroll_speed[lanes] = BASE_SCROLL_SPEED
+        self.stopwatch_timer[lanes] = 0
+        self.stopwatch_speed_reduction[lanes] = 0
+
+        self.y[lanes] = PLAYER_GROUND_Y
+        self.vel_y[lanes] = 0
+        self.jumps_left[lanes] = MAX_JUMPS
+        self.on_ground[lanes] = True
+        self.jetpack_jumps[lanes] = 0
+        self.has_beans[lanes] = False
+        self.beans_timer[lanes] = 0
+        self.ammo[lanes] = 0
+        self.acid_timer[lanes] = 0
+        self.was_in_nirvana[lanes] = False
+        self.grace_period[lanes] = 0
+
+        self.obs_count[lanes] = 0
+        self.obs_alive[lanes] = False
+        self.pow_count[lanes] = 0
+        self.bullet_count[lanes] = 0
+
+        self.jumps[lanes] = 0
+        self.shots[lanes] = 0
+        self.farts[lanes] = 0
+        self.stomps[lanes] = 0
+        self.collected[lanes] = 0
+
+    def step(self, inputs=None):
+        """Advance every live lane by one frame.
+
+        inputs is an optional per-lane array of INPUT_JUMP | INPUT_FIRE masks,
+        applied before the frame like GameEngine.step_many does. Returns the
+        done mask of lanes that died this frame; their final score and
+        death_type stay readable until the next step auto-resets them."""
+        if self.auto_reset and self.done.any():
+            self.reset_lanes(np.flatnonzero(self.done))
+        self.done[:] = False
+
+        live = ~self.game_over
+        if not live.any():
+            return self.done
+
+        if inputs is not None:
+            self._apply_inputs(np.asarray(inputs), live)
+
+        self.frame[live] += 1
+        self._update_player(live)
+        self._spawn(live)
+        self._update_speed(live)
+        self._move_entities(live)
+        self._cull()
+        self._check_powerup_collision(live)
+        self._check_bullet_hits(live)
+        self._roll_farts(live)
+        self._check_collision(live)
+        return self.done
+
+    def step_many(self, n, policy=None):
+        """Run n frames. policy(engine) may return an input mask array each frame.
+        Returns a list of (seed, score, frames, death_type) for every finished run."""
+        finished = []
+        for _ in range(n):
+            inputs = policy(self) if policy is not None else None
+            done = self.step(inputs)
+            for lane in np.flatnonzero(done).tolist():
+                death = int(self.death_type[lane])
+                finished.append((int(self.seeds[lane]), int(self.score[lane]), int(self.frame[lane]),
+                                 OBSTACLE_TYPES[death] if death >= 0 else None))
+        return finished
+
+    def _apply_inputs(self, inputs, live):
+        # Fire first, then jump - same order as the web client's handleAction()
+        fire = live & ((inputs & INPUT_FIRE) != 0) & (self.ammo > 0)
+        if fire.any():
+            lanes = np.flatnonzero(fire)
+            slots = self.bullet_count[lanes]
+            if (slots >= MAX_BULLETS).any():
+                raise RuntimeError("BatchGameEngine bullet capacity exceeded")
+            self.bullet_x[lanes, slots] = PLAYER_X + PLAYER_WIDTH
+            self.bullet_y[lanes, slots] = self.y[lanes] + 1
+            self.bullet_count[lanes] += 1
+            self.ammo[lanes] -= 1
+            self.shots[lanes] += 1
+
+        jump = live & ((inputs & INPUT_JUMP) != 0) & (self.jumps_left > 0)
+        if jump.any():
+            self.vel_y[jump] = JUMP_FORCE
+            self.jumps_left[jump] -= 1
+            self.on_ground[jump] = False
+            self.jetpack_jumps[jump & (self.jetpack_jumps > 0)] -= 1
+            self.jumps[jump] += 1
+
+    def _update_player(self, live):
+        """Player.update() for every live lane"""
+        # acid_timer / 60 > 20 seconds is nirvana (acid level 3)
+        nirvana = self.acid_timer > 1200
+        self.grace_period[live & self.was_in_nirvana & ~nirvana] = 120
+        self.was_in_nirvana[live] = nirvana[live]
+        self.grace_period[live & (self.grace_period > 0)] -= 1
+
+        floating = live & nirvana
+        self.y[floating] += (6 - self.y[floating]) * 0.1
+        self.vel_y[floating] = 0
+        self.on_ground[floating] = False
+
+        falling = live & ~nirvana
+        self.vel_y[falling] += GRAVITY
+        self.y[falling] += self.vel_y[falling]
+        landed = falling & (self.y >= PLAYER_GROUND_Y)
+        self.y[landed] = PLAYER_GROUND_Y
+        self.vel_y[landed] = 0
+        self.jumps_left[landed] = MAX_JUMPS + (self.jetpack_jumps[landed] > 0)
+        self.on_ground[landed] = True
+
+        beans = live & self.has_beans
+        self.beans_timer[beans] -= 1
+        self.has_beans[beans & (self.beans_timer <= 0)] = False
+
+        self.acid_timer[live & (self.acid_timer > 0)] -= 1
+
+    def _spawn(self, live):
+        """spawn_obstacle() and spawn_powerup() - random rolls happen per lane"""
+        due = live & (self.spawn_timer <= 0)
+        self.spawn_timer[live & ~due] -= 1
+        self.powerup_timer[live] -= 1
+        powerup_due = live & (self.powerup_timer <= 0)
+
+        for lane in np.flatnonzero(due | powerup_due).tolist():
+            rng = self.rngs[lane]
+            if due[lane]:
+                slot = int(self.obs_count[lane])
+                if slot >= MAX_OBSTACLES:
+                    raise RuntimeError("BatchGameEngine obstacle capacity exceeded")
+                obs = Obstacle(SCREEN_COLS, pick_obstacle_type(int(self.score[lane]), rng), rng)
+                self.obs_x[lane, slot] = obs.x
+                self.obs_y[lane, slot] = obs.y
+                self.obs_fly_y[lane, slot] = obs.fly_y if obs.flying else 0
+                self.obs_width[lane, slot] = obs.width
+                self.obs_height[lane, slot] = obs.height
+                self.obs_type[lane, slot] = OBSTACLE_CODES[obs.obstacle_type]
+                self.obs_flying[lane, slot] = obs.flying
+                self.obs_alive[lane, slot] = True
+                self.obs_count[lane] = slot + 1
+                self.spawn_timer[lane] = obstacle_spawn_delay(float(self.scroll_speed[lane]), obs.width, rng)
+            if powerup_due[lane]:
+                slot = int(self.pow_count[lane])
+                if slot >= MAX_POWERUPS:
+                    raise RuntimeError("BatchGameEngine powerup capacity exceeded")
+                powerup = Powerup(SCREEN_COLS, rng.choice(POWERUP_TYPES), rng)
+                self.pow_x[lane, slot] = powerup.x
+                self.pow_y[lane, slot] = powerup.y
+                self.pow_type[lane, slot] = POWERUP_CODES[powerup.type]
+                self.pow_count[lane] = slot + 1
+                self.powerup_timer[lane] = rng.randint(80, 180)
+
+    def _update_speed(self, live):
+        base_speed = BASE_SCROLL_SPEED + self.score / SPEED_PROGRESSION
+        slowed = live & (self.stopwatch_timer > 0)
+        self.stopwatch_timer[slowed] -= 1
+        effect_ratio = self.stopwatch_timer / 300
+        self.scroll_speed = np.where(
+            slowed, base_speed - self.stopwatch_speed_reduction * effect_ratio,
+            np.where(live, base_speed, self.scroll_speed))
+        self.stopwatch_speed_reduction[live & ~slowed] = 0
+
+    def _move_entities(self, live):
+        speed = np.where(live, self.scroll_speed, 0)[:, None]
+        self.obs_x -= speed
+        flying = self.obs_flying & live[:, None]
+        self.obs_y = np.where(flying, self.obs_fly_y + np.sin(self.obs_x * 0.1) * 2, self.obs_y)
+        self.pow_x -= speed
+        self.bullet_x += np.where(live, BULLET_SPEED, 0)[:, None]
+
+    def _cull(self):
+        slots = np.arange(MAX_OBSTACLES)
+        keep = (slots < self.obs_count[:, None]) & self.obs_alive & ~(self.obs_x + self.obs_width < 0)
+        self.obs_count = _compact(keep, self.obs_count, self, ("obs_x", "obs_y", "obs_fly_y", "obs_width",
+                                                               "obs_height", "obs_type", "obs_flying", "obs_alive"))
+        self.obs_alive &= slots < self.obs_count[:, None]
+
+        keep = (np.arange(MAX_POWERUPS) < self.pow_count[:, None]) & ~(self.pow_x + POWERUP_WIDTH < 0)
+        self.pow_count = _compact(keep, self.pow_count, self, ("pow_x", "pow_y", "pow_type"))
+
+        keep = (np.arange(MAX_BULLETS) < self.bullet_count[:, None]) & ~(self.bullet_x >= SCREEN_COLS)
+        self.bullet_count = _compact(keep, self.bullet_count, self, ("bullet_x", "bullet_y"))
+
+    def _check_powerup_collision(self, live):
+        py = np.trunc(self.y)
+        picked = np.zeros((self.num_lanes, MAX_POWERUPS), dtype=bool)
+        for slot in range(int(self.pow_count.max(initial=0))):
+            ox = np.trunc(self.pow_x[:, slot])
+            oy = np.trunc(self.pow_y[:, slot])
+            hit = (live & (slot < self.pow_count) &
+                   (PLAYER_X < ox + POWERUP_WIDTH) & (PLAYER_X + PLAYER_WIDTH > ox) &
+                   (py < oy + POWERUP_HEIGHT) & (py + PLAYER_HEIGHT > oy))
+            if not hit.any():
+                continue
+            picked[:, slot] = hit
+            kind = self.pow_type[:, slot]
+            for code in range(len(POWERUP_TYPES)):
+                self.collected[hit & (kind == code), code] += 1
+
+            jetpack = hit & (kind == POWERUP_CODES[POWERUP_JETPACK])
+            self.jetpack_jumps[jetpack] += 10
+            self.jumps_left[jetpack] = MAX_JUMPS + (self.jetpack_jumps[jetpack] > 0)
+            beans = hit & (kind == POWERUP_CODES[POWERUP_BEANS])
+            self.has_beans[beans] = True
+            self.beans_timer[beans] = 600
+            self.ammo[hit & (kind == POWERUP_CODES[POWERUP_PISTOL])] += 10
+            self.acid_timer[hit & (kind == POWERUP_CODES[POWERUP_ACID])] += 600
+            stopwatch = hit & (kind == POWERUP_CODES[POWERUP_STOPWATCH])
+            self.stopwatch_timer[stopwatch] = 300
+            self.stopwatch_speed_reduction[stopwatch] = self.scroll_speed[stopwatch] * 0.6
+
+        if picked.any():
+            keep = (np.arange(MAX_POWERUPS) < self.pow_count[:, None]) & ~picked
+            self.pow_count = _compact(keep, self.pow_count, self, ("pow_x", "pow_y", "pow_type"))
+
+    def _check_bullet_hits(self, live):
+        if not self.bullet_count.any():
+            return
+        ox = np.trunc(self.obs_x)
+        oy = np.trunc(self.obs_y)
+        lanes = np.arange(self.num_lanes)
+        spent = np.zeros((self.num_lanes, MAX_BULLETS), dtype=bool)
+        for slot in range(int(self.bullet_count.max())):
+            bx = np.trunc(self.bullet_x[:, slot])[:, None]
+            by = np.trunc(self.bullet_y[:, slot])[:, None]
+            inside = (self.obs_alive & (live & (slot < self.bullet_count))[:, None] &
+                      (bx >= ox) & (bx < ox + self.obs_width) &
+                      (by >= oy) & (by < oy + self.obs_height))
+            hit = inside.any(axis=1)
+            if hit.any():
+                # Each bullet kills the first live obstacle it overlaps
+                first = inside.argmax(axis=1)
+                self.obs_alive[lanes[hit], first[hit]] = False
+                spent[:, slot] = hit
+
+        if spent.any():
+            keep = (np.arange(MAX_BULLETS) < self.bullet_count[:, None]) & ~spent
+            self.bullet_count = _compact(keep, self.bullet_count, self, ("bullet_x", "bullet_y"))
+
+    def _roll_farts(self, live):
+        for lane in np.flatnonzero(live & self.has_beans).tolist():
+            if self.rngs[lane].random() < 0.005:
+                self.vel_y[lane] = JUMP_FORCE * 0.8
+                self.on_ground[lane] = False
+                self.farts[lane] += 1
+
+    def _check_collision(self, live):
+        """check_collision() with Mario-style stomps and flat-top landings, then scoring"""
+        hitbox_padding = 1
+        px = PLAYER_X + hitbox_padding
+        player_width = PLAYER_WIDTH - hitbox_padding * 2
+        py = np.trunc(self.y) + hitbox_padding
+        player_bottom = py + PLAYER_HEIGHT - hitbox_padding
+
+        collided = np.zeros(self.num_lanes, dtype=bool)
+        death_type = np.full(self.num_lanes, -1, dtype=np.int8)
+        for slot in range(int(self.obs_count.max(initial=0))):
+            ox = np.trunc(self.obs_x[:, slot])
+            oy = np.trunc(self.obs_y[:, slot])
+            kind = self.obs_type[:, slot]
+            overlap = (live & ~collided & self.obs_alive[:, slot] &
+                       (px < ox + self.obs_width[:, slot]) & (px + player_width > ox) &
+                       (py < oy + self.obs_height[:, slot]) & (player_bottom > oy))
+            if not overlap.any():
+                continue
+            landing_on_top = overlap & (player_bottom <= oy + 3) & (self.vel_y >= 0)
+
+            stomp = landing_on_top & IS_ORGANIC[kind]
+            self.obs_alive[stomp, slot] = False
+            self.vel_y[stomp] = JUMP_FORCE * 0.6
+            self.on_ground[stomp] = False
+            self.stomps[stomp] += 1
+
+            land = landing_on_top & IS_FLAT_TOP[kind]
+            self.y[land] = oy[land] - PLAYER_HEIGHT
+            self.vel_y[land] = 0
+            self.jumps_left[land] = MAX_JUMPS + (self.jetpack_jumps[land] > 0)
+            self.on_ground[land] = True
+
+            fatal = overlap & ~stomp & ~land
+            collided |= fatal
+            death_type[fatal] = kind[fatal]
+
+        invincible = (self.acid_timer > 1200) | (self.grace_period > 0)
+        died = collided & ~invincible
+        self.game_over |= died
+        self.done |= died
+        self.death_type[died] = death_type[died]
+        self.high_score = np.where(died, np.maximum(self.high_score, self.score), self.high_score)
+        self.score[live & ~died] += 1
+
+
+def _compact(keep, count, owner, fields):
+    """Stable-compact the kept slots of each lane to the front; returns new counts"""
+    new_count = keep.sum(axis=1)
+    # Nothing to move when every lane only dropped slots from the end
+    if (keep == (np.arange(keep.shape[1]) < new_count[:, None])).all():
+        return new_count
+    order = np.argsort(~keep, axis=1, kind="stable")
+    for name in fields:
+        setattr(owner, name, np.take_along_axis(getattr(owner, name), order, axis=1))
+    return new_count
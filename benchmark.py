@@ -0,0 +1,222 @@
+# ASCII Runner - Benchmark Suite
+# Drives GameEngine headlessly through fixed, seeded scenarios and times the
+# simulation step (update), the packed render (render_screen - what the browser
+# draws) and the tuple export separately. screen_buffer is only the conversion
+# get_screen_buffer() adds on top of a render: to_tuples() on the frame the
+# render metric just drew.
+#
+#   python benchmark.py                          # all scenarios, JSON to stdout
+#   python benchmark.py -o baseline.json         # save a baseline
+#   python benchmark.py --compare baseline.json  # flag regressions, exit 1 if any
+#   python benchmark.py -s lava -s acid_3 --frames 300
+#   python benchmark.py -s startup               # cold start: compile, import, first frame
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+import game_engine
+from game_engine import GameEngine, INPUT_FIRE, PERF_PERCENTILES
+
+SEED = 1234
+WARMUP_FRAMES = 120
+MEASURE_FRAMES = 600
+STARTUP_RUNS = 20
+REGRESSION_THRESHOLD = 0.15  # Flag metrics whose p50 grew by more than this fraction
+METRICS = ("update", "render", "screen_buffer")
+
+
+# Each scenario pins the engine in one situation. hold(engine) runs before
+# every frame (outside the timings) and puts the scenario's state back, so
+# the score never drifts into the next environment and the run never ends.
+
+def hold_score(score):
+    def hold(engine):
+        engine.game_over = False
+        engine.score = score
+    return hold
+
+
+def hold_acid(score, acid_timer):
+    def hold(engine):
+        hold_score(score)(engine)
+        engine.player.acid_timer = acid_timer
+    return hold
+
+
+def hold_snowfall(engine):
+    hold_score(1500)(engine)
+    while len(engine.snowflakes) < 30:
+        engine.snowflakes.emit(engine.cosmetic_rng)
+
+
+def hold_camera_up(engine):
+    # Bob the player high above the ground so the camera pans through the stars
+    hold_score(0)(engine)
+    engine.player.y = -10 - 8 * math.sin(engine.frame * 0.05)
+    engine.player.vel_y = 0
+
+
+def hold_bullet_spam(engine):
+    hold_score(0)(engine)
+    engine.player.ammo = 99
+    engine.apply_input(INPUT_FIRE)
+
+
+def hold_game_over(engine):
+    engine.game_over = True
+
+
+SCENARIOS = {
+    "grass": hold_score(0),
+    "desert": hold_score(600),
+    "snow": hold_snowfall,
+    "cave": hold_score(2500),
+    "lava": hold_score(3200),
+    "acid_1": hold_acid(0, 5 * 60),
+    "acid_2": hold_acid(0, 15 * 60),
+    "acid_3": hold_acid(0, 25 * 60),
+    "camera_up": hold_camera_up,
+    "bullet_spam": hold_bullet_spam,
+    "game_over": hold_game_over,
+}
+
+
+STARTUP_METRICS = ("compile", "import", "engine", "first_frame")
+SCENARIO_NAMES = list(SCENARIOS) + ["startup"]
+
+
+def summarize(samples):
+    """Timing summary in microseconds for a list of nanosecond samples"""
+    samples = sorted(samples)
+    k = len(samples)
+    summary = {"mean": sum(samples) / k / 1000, "min": samples[0] / 1000}
+    for name, q in PERF_PERCENTILES:
+        summary[name] = samples[min(k - 1, int(k * q))] / 1000
+    return summary
+
+
+def run_startup(runs=STARTUP_RUNS, seed=SEED):
+    """Times the cold start the web loader goes through, from engine source to
+    first rendered frame, in a fresh module namespace each run"""
+    with open(game_engine.__file__, "rb") as f:
+        source = f.read()
+    clock = time.perf_counter_ns
+    samples = {metric: [] for metric in STARTUP_METRICS}
+
+    for _ in range(runs):
+        t0 = clock()
+        code = compile(source, game_engine.__file__, "exec")
+        t1 = clock()
+        module = {"__name__": "game_engine_cold"}
+        exec(code, module)
+        t2 = clock()
+        engine = module["GameEngine"](seed)
+        t3 = clock()
+        engine.tick()
+        t4 = clock()
+        for metric, elapsed in zip(STARTUP_METRICS, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            samples[metric].append(elapsed)
+
+    return {metric: summarize(values) for metric, values in samples.items()}
+
+
+def run_scenario(name, frames=MEASURE_FRAMES, warmup=WARMUP_FRAMES, seed=SEED):
+    """Times one scenario and returns {metric: summary}"""
+    if name == "startup":
+        return run_startup(seed=seed)
+    hold = SCENARIOS[name]
+    engine = GameEngine(seed)
+    game_over = name == "game_over"
+    render = engine.get_packed_game_over_buffer if game_over else engine.get_packed_screen_buffer
+    clock = time.perf_counter_ns
+    samples = {metric: [] for metric in METRICS}
+
+    for frame in range(warmup + frames):
+        hold(engine)
+        t0 = clock()
+        engine.update()
+        t1 = clock()
+        render()
+        t2 = clock()
+        engine.framebuffer.to_tuples()
+        t3 = clock()
+        if frame >= warmup:
+            samples["update"].append(t1 - t0)
+            samples["render"].append(t2 - t1)
+            samples["screen_buffer"].append(t3 - t2)
+
+    return {metric: summarize(values) for metric, values in samples.items()}
+
+
+def run(names, frames=MEASURE_FRAMES, warmup=WARMUP_FRAMES, seed=SEED):
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "seed": seed,
+        "warmup": warmup,
+        "frames": frames,
+        "scenarios": {name: run_scenario(name, frames, warmup, seed) for name in names},
+    }
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Returns (rows, regressions): one (scenario, metric, base_p50, p50, ratio)
+    row per metric present in both runs; regressions are the rows whose p50
+    grew by more than threshold"""
+    rows = []
+    for name, metrics in results["scenarios"].items():
+        base_metrics = baseline["scenarios"].get(name)
+        if base_metrics is None:
+            continue
+        for metric, summary in metrics.items():
+            if metric not in base_metrics:
+                continue
+            base = base_metrics[metric]["p50"]
+            ratio = summary["p50"] / base if base else 1.0
+            rows.append((name, metric, base, summary["p50"], ratio))
+    regressions = [row for row in rows if row[4] > 1 + threshold]
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GameEngine update and render per scenario")
+    parser.add_argument("-s", "--scenario", action="append", choices=SCENARIO_NAMES,
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--frames", type=int, default=MEASURE_FRAMES, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=WARMUP_FRAMES, help="untimed frames before measuring")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare p50s against a saved results file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed p50 growth before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.scenario or SCENARIO_NAMES, args.frames, args.warmup, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    elif not args.compare:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, regressions = compare(results, baseline, args.threshold)
+        print(f"{'scenario':<12} {'metric':<14} {'base p50':>10} {'p50':>10} {'change':>8}")
+        for name, metric, base, p50, ratio in rows:
+            flag = "  REGRESSION" if ratio > 1 + args.threshold else ""
+            print(f"{name:<12} {metric:<14} {base:>10.1f} {p50:>10.1f} {ratio - 1:>+8.1%}{flag}")
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# ASCII Runner - Engine Bundle Builder
+# Precompiles game_engine.py into game_engine.zip for the web loader, so page
+# loads skip parsing and compiling the engine source inside Pyodide. The zip
+# holds a sourceless game_engine.pyc and the SHA-256 of the source it came from;
+# game_pyodide.js only imports it when that hash matches the game_engine.py it
+# fetched, and falls back to the source for a missing, stale or incompatible
+# bundle.
+#
+#   python3.11 build_bundle.py    # bytecode only loads on the same Python minor
+#                                 # version as Pyodide (0.24 ships Python 3.11)
+#
+# Deploys run this as the vercel.json build step, with a Python 3.11 fetched by
+# uv (the build image has a different Python). The zip is a build output and
+# is not committed.
+
+import argparse
+import hashlib
+import importlib.util
+import io
+import marshal
+import sys
+import zipfile
+
+PYODIDE_PYTHON = (3, 11)
+SOURCE = "game_engine.py"
+BUNDLE = "game_engine.zip"
+
+
+def build(source=SOURCE, bundle=BUNDLE):
+    """Writes the bundle and returns the sizes of the source and the bundle, in bytes"""
+    with open(source, "rb") as f:
+        text = f.read()
+    # optimize=2 drops docstrings - nothing in the engine reads them
+    code = compile(text, source, "exec", optimize=2)
+    # Unchecked-hash pyc header: magic, flags, then 8 unused bytes
+    pyc = importlib.util.MAGIC_NUMBER + (1).to_bytes(4, "little") + bytes(8) + marshal.dumps(code)
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("game_engine.pyc", pyc)
+        archive.writestr("game_engine.sha256", hashlib.sha256(text).hexdigest())
+    with open(bundle, "wb") as f:
+        f.write(out.getvalue())
+    return len(text), out.tell()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompile game_engine.py into a bundle for Pyodide")
+    parser.add_argument("--force", action="store_true",
+                        help="build even though this Python differs from Pyodide's")
+    args = parser.parse_args(argv)
+
+    if sys.version_info[:2] != PYODIDE_PYTHON and not args.force:
+        print("Python %d.%d cannot build bytecode for Pyodide's Python %d.%d (use --force to build anyway)"
+              % (sys.version_info[:2] + PYODIDE_PYTHON), file=sys.stderr)
+        return 1
+    source_size, bundle_size = build()
+    print(f"{BUNDLE}: {bundle_size} bytes ({SOURCE}: {source_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,11 @@
 
 import random
 import math
+import struct
+import binascii
+import bisect
+import operator
+import time
 
 # Game constants
 CHAR_WIDTH = 10
@@ -19,6 +24,11 @@ BASE_SCROLL_SPEED = 0.3
 SPEED_PROGRESSION = 2000  # +0.1 speed per 200 points
 JUMP_CLEARANCE_MULTIPLIER = 1.2
 
+# Fixed simulation timestep - every per-frame speed and timer assumes 60 steps/s
+SIM_RATE = 60
+SIM_DT = 1.0 / SIM_RATE
+MAX_CATCH_UP_STEPS = 5  # Beyond this the backlog is dropped instead of spiralling
+
 FLAT_TOP_OBSTACLES = ["easy"]
 ORGANIC_OBSTACLES = ["bird", "cow"]  # Can be stomped Mario-style
 
@@ -46,6 +56,27 @@ CREAM = (255, 253, 208)
 
 PSYCHEDELIC_COLORS = [MAGENTA, CYAN, PINK, PURPLE, ORANGE, LIME, YELLOW, RED, BLUE]
 
+# Sky and background element colors
+MOON_COLOR = (200, 200, 220)
+STAR_COLORS = [(100, 100, 120), (150, 150, 180), (200, 200, 255), (255, 255, 255)]
+STAR_COUNT = 100
+STAR_BAND = SCREEN_ROWS * 2  # Stars fill the two screen heights above the view
+MOUNTAIN_COLOR = (100, 100, 120)
+SMALL_MOUNTAIN_COLOR = (80, 80, 100)
+SNOW_DRIFT_COLOR = (220, 220, 240)
+
+# Gates of Hell colors
+HELL_FLAME = (255, 50, 0)
+HELL_FLAME_HOT = (255, 200, 0)
+HELL_TEXT = (200, 0, 0)
+HELL_TEXT_GLOW = (255, 100, 0)
+GATE_IRON = (80, 80, 90)
+GATE_RUST = (120, 60, 0)
+GATE_COLOR = (100, 100, 110)
+CHARRED = (40, 20, 10)
+CHARRED_EMBER = (60, 30, 0)
+HELL_GRADIENT = [(50 + y * 3, 0, 0) for y in range(SCREEN_ROWS)]  # Dark red dots per row
+
 # Background ASCII art (from web version)
 SUN_CHAR = [
     " \\ | / ",
@@ -239,6 +270,9 @@ EMOJI_CHARS = {
     '(': '[', ')': ']', '{': '(', '}': ')', '*': '+', '+': '*',
     'A': 'V', 'V': 'A', 'M': 'W', 'W': 'M', 'T': 'Y', 'Y': 'T',
 }
+# Same mapping as a bytes.translate table for the packed glyph plane
+EMOJI_TABLE = bytes.maketrans("".join(EMOJI_CHARS).encode('ascii'),
+                              "".join(EMOJI_CHARS.values()).encode('ascii'))
 
 # Obstacles
 OBSTACLE_CHARS_EASY = [
@@ -264,6 +298,8 @@ POWERUP_BEANS = "beans"
 POWERUP_ACID = "acid"
 POWERUP_STOPWATCH = "stopwatch"
 
+POWERUP_TYPES = [POWERUP_PISTOL, POWERUP_JETPACK, POWERUP_BEANS, POWERUP_ACID, POWERUP_STOPWATCH]
+
 POWERUP_CHARS = {
     POWERUP_PISTOL: ["[=>"],
     POWERUP_JETPACK: ["<J>"],
@@ -280,19 +316,434 @@ POWERUP_COLORS = {
     POWERUP_STOPWATCH: YELLOW,
 }
 
+# Input flags for scripted / recorded play
+INPUT_JUMP = 1
+INPUT_FIRE = 2
+
+# Palette - every color the engine can emit gets a small index, which is what
+# packed buffers store per cell (index 0 is the blank cell color)
+PALETTE = []
+PALETTE_INDEX = {}
+
+for _color in ([BLACK, GREEN, WHITE, YELLOW, RED, CYAN, MAGENTA, ORANGE, PINK, PURPLE, LIME, BLUE,
+                BROWN, TAN, GRAY, DARK_GRAY, LIGHT_BLUE, DARK_GREEN, DARK_BROWN, CREAM,
+                MOON_COLOR, MOUNTAIN_COLOR, SMALL_MOUNTAIN_COLOR, SNOW_DRIFT_COLOR,
+                HELL_FLAME, HELL_FLAME_HOT, HELL_TEXT, HELL_TEXT_GLOW, GATE_IRON, GATE_RUST,
+                GATE_COLOR, CHARRED, CHARRED_EMBER]
+               + STAR_COLORS + HELL_GRADIENT
+               + [env[key] for env in ENVIRONMENTS.values() for key in ("ground_color", "bg_color", "fill_color")]):
+    if _color not in PALETTE_INDEX:
+        PALETTE_INDEX[_color] = len(PALETTE)
+        PALETTE.append(_color)
+del _color
+
+def color_index(color):
+    """Returns the palette index for an RGB tuple"""
+    return PALETTE_INDEX[color]
+
+PSYCHEDELIC_INDICES = [color_index(c) for c in PSYCHEDELIC_COLORS]
+
+# Psychedelic color wave: cell (i, j) of a rainbow sprite at phase p gets
+# PSYCHEDELIC_CYCLE[(i + p) % len(PSYCHEDELIC_INDICES) + j]
+PSYCHEDELIC_CYCLE = bytes(PSYCHEDELIC_INDICES[k % len(PSYCHEDELIC_INDICES)]
+                          for k in range(len(PSYCHEDELIC_INDICES) + SCREEN_COLS))
+
 # Calculate physics
 def get_max_obstacle_height():
     all_obstacles = OBSTACLE_CHARS_EASY + [BIRD_CHAR, COW_CHAR, HOUSE_CHAR, CACTUS_CHAR, SPIKE_CHAR]
     return max(len(obs) for obs in all_obstacles)
 
 MAX_OBSTACLE_HEIGHT = get_max_obstacle_height()
+# Widest obstacle - bounds the broad-phase search window in check_bullet_hits
+MAX_OBSTACLE_WIDTH = max(max(len(row) for row in obs)
+                         for obs in OBSTACLE_CHARS_EASY + [BIRD_CHAR, COW_CHAR, HOUSE_CHAR, CACTUS_CHAR, SPIKE_CHAR])
 DESIRED_JUMP_HEIGHT = MAX_OBSTACLE_HEIGHT * JUMP_CLEARANCE_MULTIPLIER
 GRAVITY = 0.035
 JUMP_FORCE = -math.sqrt(2 * GRAVITY * DESIRED_JUMP_HEIGHT)
 JUMP_DURATION = 2 * (-JUMP_FORCE / GRAVITY)
 
+# Packed framebuffer layout: three planes of SCREEN_ROWS * SCREEN_COLS bytes
+# (glyph code, palette index, depth) stored back to back, row-major
+FRAME_CELLS = SCREEN_ROWS * SCREEN_COLS
+GLYPH_PLANE = 0
+COLOR_PLANE = FRAME_CELLS
+DEPTH_PLANE = FRAME_CELLS * 2
+BLANK_FRAME = b' ' * FRAME_CELLS + bytes(FRAME_CELLS) + bytes([2]) * FRAME_CELLS
+
+# Tick buffer layout (see GameEngine.tick): one little-endian int32 per field,
+# then the packed framebuffer. "events" holds the TICK_* flags and "collected"
+# has bit i set when POWERUP_TYPES[i] was picked up during the tick.
+TICK_FIELDS = (
+    "inputs", "steps", "events", "collected",
+    "score", "high_score", "frame", "stopwatch_timer",
+    "jumps_left", "ammo", "jetpack_jumps", "has_beans", "beans_timer",
+    "acid_timer", "acid_level", "grace_period",
+)
+TICK_HEADER = struct.Struct("<%di" % len(TICK_FIELDS))
+TICK_GAME_OVER = 1
+TICK_DIED = 2
+TICK_FARTED = 4
+TICK_STOMPED = 8
+
+
+# Runs of a single palette index / depth, sliced to length when blitting
+COLOR_ROWS = [bytes([i]) * SCREEN_COLS for i in range(len(PALETTE))]
+DEPTH_ROWS = [bytes([d]) * SCREEN_COLS for d in range(3)]
+
+
+class Sprite:
+    """ASCII art compiled once into opaque runs (row, start, glyphs, mask)
+
+    Spaces are transparent, so each row becomes one run per stretch of
+    non-space characters. A solid sprite keeps whole rows instead and its
+    spaces overwrite with BLACK; mask marks which cells take the sprite
+    color (1) and which stay blank (0). mask is None for normal sprites."""
+
+    def __init__(self, art, solid=False):
+        self.art = art
+        self.runs = []
+        for i, row in enumerate(art):
+            if solid:
+                if row:
+                    mask = bytes(0 if char == ' ' else 1 for char in row)
+                    self.runs.append((i, 0, row.encode('ascii'), mask))
+                continue
+            j = 0
+            while j < len(row):
+                if row[j] == ' ':
+                    j += 1
+                    continue
+                start = j
+                while j < len(row) and row[j] != ' ':
+                    j += 1
+                self.runs.append((i, start, row[start:j].encode('ascii'), None))
+
+        # Bounding box of the runs relative to the sprite origin
+        if self.runs:
+            self.left = min(start for _, start, _, _ in self.runs)
+            self.right = max(start + len(glyphs) for _, start, glyphs, _ in self.runs)
+            self.top = self.runs[0][0]
+            self.bottom = self.runs[-1][0] + 1
+        else:
+            self.left = self.right = self.top = self.bottom = 0
+
+
+SPRITES = {}
+
+def get_sprite(art, solid=False):
+    """Returns the compiled Sprite for an art block, compiling it on first use"""
+    key = (tuple(art), solid)
+    sprite = SPRITES.get(key)
+    if sprite is None:
+        sprite = SPRITES[key] = Sprite(art, solid)
+    return sprite
+
+# Sprites compile when first drawn rather than at import, to keep startup
+# short: draw code calls get_sprite(art) instead of holding module constants
+BULLET_CHAR = ["->"]
+
+# Terrain band layout (rows)
+BG_TERRAIN_TOP = 12
+BG_TERRAIN_BOTTOM = 17
+BG_HILL_WIDTH = 8  # The background line steps up/down every 8 columns
+
+
+class Terrain:
+    """Scrolling terrain strips for one environment, built once. Each strip is
+    periodic in the scroll offset, so it is stored extended by one period and a
+    frame's row is the SCREEN_COLS slice starting at offset % period."""
+
+    def __init__(self, env):
+        # Background line: bg_chars stepping between three rows. Stored as a
+        # sprite so the cells between steps stay transparent.
+        bg_chars = env["bg_chars"]
+        self.bg_period = math.lcm(BG_HILL_WIDTH * 3, len(bg_chars))
+        width = SCREEN_COLS + self.bg_period
+        self.bg_sprite = Sprite([
+            "".join(bg_chars[k % len(bg_chars)] if (k // BG_HILL_WIDTH) % 3 - 1 == dy else " "
+                    for k in range(width))
+            for dy in (-1, 0, 1)
+        ])
+
+        fill_char = env["fill_char"]
+        fill_chars = [fill_char, '.', fill_char, ':']  # Varied pattern for movement
+        self.fill_period = len(fill_chars)
+        self.fill_strip = bytes(ord(fill_chars[k % self.fill_period])
+                                for k in range(SCREEN_COLS + self.fill_period))
+
+        ground_chars = env["ground_chars"]
+        self.ground_period = len(ground_chars)
+        self.ground_strip = bytes(ord(ground_chars[k % self.ground_period])
+                                  for k in range(SCREEN_COLS + self.ground_period))
+
+
+TERRAIN = {}
+
+def get_terrain(env_name):
+    """Returns the Terrain for an environment, building it on first use"""
+    terrain = TERRAIN.get(env_name)
+    if terrain is None:
+        terrain = TERRAIN[env_name] = Terrain(ENVIRONMENTS[env_name])
+    return terrain
+
+
+class FrameBuffer:
+    """Preallocated packed screen buffer the renderer can view without conversion"""
+
+    def __init__(self):
+        self.data = bytearray(BLANK_FRAME)
+
+    def clear(self):
+        self.data[:] = BLANK_FRAME
+
+    def put(self, x, y, char, color, depth):
+        """Write one cell (color is a palette index) - callers do the bounds check"""
+        i = y * SCREEN_COLS + x
+        data = self.data
+        data[i] = ord(char)
+        data[COLOR_PLANE + i] = color
+        data[DEPTH_PLANE + i] = depth
+
+    def map_glyphs(self, table):
+        """Remap every glyph in one pass with a bytes.translate table"""
+        self.data[:FRAME_CELLS] = self.data[:FRAME_CELLS].translate(table)
+
+    def row(self, y, glyphs, color, depth):
+        """Overwrite a whole on-screen row with SCREEN_COLS glyph bytes"""
+        i = y * SCREEN_COLS
+        data = self.data
+        data[i:i + SCREEN_COLS] = glyphs
+        data[COLOR_PLANE + i:COLOR_PLANE + i + SCREEN_COLS] = COLOR_ROWS[color]
+        data[DEPTH_PLANE + i:DEPTH_PLANE + i + SCREEN_COLS] = DEPTH_ROWS[depth]
+
+    def text(self, x, y, text, color, depth):
+        """Write a string on one row (spaces included), clipped to the screen"""
+        if not 0 <= y < SCREEN_ROWS:
+            return
+        lo = max(0, -x)
+        hi = min(len(text), SCREEN_COLS - x)
+        if lo >= hi:
+            return
+        n = hi - lo
+        i = y * SCREEN_COLS + x + lo
+        data = self.data
+        data[i:i + n] = text[lo:hi].encode('ascii')
+        data[COLOR_PLANE + i:COLOR_PLANE + i + n] = COLOR_ROWS[color][:n]
+        data[DEPTH_PLANE + i:DEPTH_PLANE + i + n] = DEPTH_ROWS[depth][:n]
+
+    def blit(self, sprite, x, y, color, depth, phase=None):
+        """Draw a compiled sprite with its origin at (x, y), clipped to the screen.
+        With phase set, colors follow the PSYCHEDELIC_CYCLE wave instead of color."""
+        if (x + sprite.right <= 0 or x + sprite.left >= SCREEN_COLS or
+                y + sprite.bottom <= 0 or y + sprite.top >= SCREEN_ROWS):
+            return
+        clipped = (x + sprite.left < 0 or x + sprite.right > SCREEN_COLS or
+                   y + sprite.top < 0 or y + sprite.bottom > SCREEN_ROWS)
+        data = self.data
+        color_row = COLOR_ROWS[color]
+        depth_row = DEPTH_ROWS[depth]
+        color_byte = color_row[:1]
+        cycle_len = len(PSYCHEDELIC_INDICES)
+
+        for row, start, glyphs, mask in sprite.runs:
+            sy = y + row
+            sx = x + start
+            n = len(glyphs)
+            lo = 0
+            if clipped:
+                if not 0 <= sy < SCREEN_ROWS:
+                    continue
+                if sx < 0:
+                    lo = -sx
+                if sx + n > SCREEN_COLS:
+                    n = SCREEN_COLS - sx
+                if lo >= n:
+                    continue
+                glyphs = glyphs[lo:n]
+                if mask is not None:
+                    mask = mask[lo:n]
+                sx += lo
+                n -= lo
+            i = sy * SCREEN_COLS + sx
+            data[i:i + n] = glyphs
+            if phase is not None:
+                c = (row + phase) % cycle_len + start + lo
+                colors = PSYCHEDELIC_CYCLE[c:c + n]
+                if mask is not None:
+                    colors = bytes(map(int.__mul__, colors, mask))
+                data[COLOR_PLANE + i:COLOR_PLANE + i + n] = colors
+            elif mask is not None:
+                data[COLOR_PLANE + i:COLOR_PLANE + i + n] = mask.replace(b'\x01', color_byte)
+            else:
+                data[COLOR_PLANE + i:COLOR_PLANE + i + n] = color_row[:n]
+            data[DEPTH_PLANE + i:DEPTH_PLANE + i + n] = depth_row[:n]
+
+    def row_spans(self, y):
+        """Returns row y as (depth, color_index, start_col, text) spans, merging
+        adjacent cells that share color and depth. Blank cells start no span;
+        a blank between two cells of the same span stays inside its text."""
+        i = y * SCREEN_COLS
+        data = self.data
+        glyphs = data[i:i + SCREEN_COLS]
+        colors = data[COLOR_PLANE + i:COLOR_PLANE + i + SCREEN_COLS]
+        depths = data[DEPTH_PLANE + i:DEPTH_PLANE + i + SCREEN_COLS]
+        spans = []
+        start = end = -1
+        color = depth = None
+        for x in range(SCREEN_COLS):
+            if glyphs[x] == 32:
+                continue
+            if colors[x] == color and depths[x] == depth and start >= 0:
+                end = x + 1
+                continue
+            if start >= 0:
+                spans.append((depth, color, start, glyphs[start:end].decode('ascii')))
+            start, end = x, x + 1
+            color, depth = colors[x], depths[x]
+        if start >= 0:
+            spans.append((depth, color, start, glyphs[start:end].decode('ascii')))
+        return spans
+
+    def to_spans(self):
+        """Returns one list of row_spans() per screen row"""
+        return [self.row_spans(y) for y in range(SCREEN_ROWS)]
+
+    def to_tuples(self):
+        """Returns the 2D array of (char, color, depth) tuples used by the original API"""
+        data = self.data
+        glyphs = data[:FRAME_CELLS].decode('ascii')
+        colors = [PALETTE[c] for c in data[COLOR_PLANE:DEPTH_PLANE]]
+        depths = data[DEPTH_PLANE:]
+        screen = []
+        for y in range(SCREEN_ROWS):
+            start = y * SCREEN_COLS
+            end = start + SCREEN_COLS
+            screen.append(list(zip(glyphs[start:end], colors[start:end], depths[start:end])))
+        return screen
+
+
+# Game over screen
+GAME_OVER_GROUND_Y = SCREEN_ROWS - 3
+GAME_OVER_DOT_FRAMES = 16  # Pre-rolled background dot layouts to pick from
+GAME_OVER_POOL_SIZE = 4096  # Length of each pre-rolled random color / glyph pool
+GAME_OVER_FLAMES = 40
+FLAME_CHARS = "^WM*~vA"
+
+
+class GameOverScreen:
+    """The Gates of Hell death screen, rasterized once.
+
+    The gate, its static colors and the player figure form a template;
+    GAME_OVER_DOT_FRAMES copies of it carry different random dark red dot
+    layouts. Each frame copies one of those and then re-rolls only the
+    animated cells - flickering gate flames, text and iron, the charred
+    ground and the loose flames - from pre-rolled random pools, so drawing
+    costs a handful of slices and short loops."""
+
+    def __init__(self, rng):
+        ci = PALETTE_INDEX
+        fb = FrameBuffer()
+        gates_x = (SCREEN_COLS - len(GATES_OF_HELL[0])) // 2
+        gates = get_sprite(GATES_OF_HELL)
+        figure = get_sprite(DEATH_PLAYER)
+        fb.blit(gates, gates_x, 0, ci[GATE_COLOR], 2)
+
+        # Sort the gate cells into flicker classes by character
+        def pool(pick):
+            return bytes(pick() for _ in range(GAME_OVER_POOL_SIZE))
+
+        classes = [
+            # Flames coming from gates
+            ('()', pool(lambda: rng.choice([ci[RED], ci[ORANGE], ci[YELLOW], ci[HELL_FLAME]])
+                        if rng.random() < 0.7 else ci[HELL_FLAME_HOT])),
+            # Rising flames
+            ('^', pool(lambda: rng.choice([ci[ORANGE], ci[YELLOW], ci[RED]]))),
+            # Title text - ominous glow
+            ('ABANDONALLHOPE', pool(lambda: ci[HELL_TEXT] if rng.random() < 0.9 else ci[HELL_TEXT_GLOW])),
+            # Gate structure - dark iron
+            ('|_/\\', pool(lambda: ci[GATE_IRON] if rng.random() < 0.85 else ci[GATE_RUST])),
+        ]
+        cells = [[] for _ in classes]
+        player_x, player_y = SCREEN_COLS // 2 - 1, 19
+        # The player is drawn over the gate, so the cells it covers never flicker
+        scratch = FrameBuffer()
+        scratch.blit(figure, player_x, player_y, ci[CYAN], 0)
+        player_cells = {i for i in range(FRAME_CELLS) if scratch.data[DEPTH_PLANE + i] == 0}
+        for row, start, glyphs, _ in gates.runs:
+            for j, char in enumerate(glyphs.decode('ascii')):
+                i = row * SCREEN_COLS + gates_x + start + j
+                if i in player_cells:
+                    continue
+                if char == 'o':
+                    fb.data[COLOR_PLANE + i] = ci[CYAN]  # Player head
+                    continue
+                for k, (chars, _) in enumerate(classes):
+                    if char in chars:
+                        cells[k].append(COLOR_PLANE + i)
+                        break
+        self.animated = [(offsets, colors) for offsets, (_, colors) in zip(cells, classes)]
+
+        # Player figure in front of gates (centered at bottom of gate opening)
+        fb.blit(figure, player_x, player_y, ci[CYAN], 2)
+        template = bytes(fb.data)
+
+        # Dark red dots on 10% of the cells the template leaves blank (the ground row is redrawn anyway)
+        blank = [i for i in range(FRAME_CELLS) if template[i] == 32 and i // SCREEN_COLS != GAME_OVER_GROUND_Y]
+        self.frames = []
+        for _ in range(GAME_OVER_DOT_FRAMES):
+            fb.data[:] = template
+            for i in blank:
+                if rng.random() < 0.1:
+                    fb.put(i % SCREEN_COLS, i // SCREEN_COLS, '.', ci[HELL_GRADIENT[i // SCREEN_COLS]], 2)
+            self.frames.append(bytes(fb.data))
+
+        # Loose flames pouring out of the gate opening, drawn over blank or dot cells
+        gate_center = SCREEN_COLS // 2
+        self.flame_cells = [y * SCREEN_COLS + x for y in range(8, 19) for x in range(gate_center - 8, gate_center + 9)]
+        self.flame_glyphs = pool(lambda: ord(rng.choice(FLAME_CHARS)))
+        self.flame_colors = pool(lambda: rng.choice([ci[RED], ci[ORANGE], ci[YELLOW], ci[HELL_TEXT_GLOW]]))
+
+        # Ground - charred earth
+        self.ground_glyphs = pool(lambda: ord(rng.choice('#=_~')))
+        self.ground_colors = pool(lambda: ci[CHARRED] if rng.random() < 0.7 else ci[CHARRED_EMBER])
+
+    def draw(self, fb, rng):
+        data = fb.data
+        data[:] = self.frames[rng.randrange(GAME_OVER_DOT_FRAMES)]
+
+        for offsets, colors in self.animated:
+            k = rng.randrange(GAME_OVER_POOL_SIZE - len(offsets))
+            for i, color in zip(offsets, colors[k:k + len(offsets)]):
+                data[i] = color
+
+        k = rng.randrange(GAME_OVER_POOL_SIZE - GAME_OVER_FLAMES)
+        glyphs = self.flame_glyphs[k:k + GAME_OVER_FLAMES]
+        colors = self.flame_colors[k:k + GAME_OVER_FLAMES]
+        for n, i in enumerate(rng.choices(self.flame_cells, k=GAME_OVER_FLAMES)):
+            # Only draw if not overwriting important stuff
+            if data[i] == 32 or data[i] == 46:
+                data[i] = glyphs[n]
+                data[COLOR_PLANE + i] = colors[n]
+
+        i = GAME_OVER_GROUND_Y * SCREEN_COLS
+        k = rng.randrange(GAME_OVER_POOL_SIZE - 2 * SCREEN_COLS)
+        data[i:i + SCREEN_COLS] = self.ground_glyphs[k:k + SCREEN_COLS]
+        k = rng.randrange(GAME_OVER_POOL_SIZE - 2 * SCREEN_COLS)
+        data[COLOR_PLANE + i:COLOR_PLANE + i + SCREEN_COLS] = self.ground_colors[k:k + SCREEN_COLS]
+
+
+GAME_OVER_SCREENS = []
+
+def get_game_over_screen():
+    """Returns the shared GameOverScreen, building it on the first game over"""
+    if not GAME_OVER_SCREENS:
+        GAME_OVER_SCREENS.append(GameOverScreen(random.Random("game over")))
+    return GAME_OVER_SCREENS[0]
+
 
 class Bullet:
+    __slots__ = ("x", "y", "speed", "char")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -306,83 +757,193 @@ class Bullet:
         return self.x >= SCREEN_COLS
 
 
-class FartPuff:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.life = 15
-        self.chars = ["~", "o", "*", "."]
+class ParticleSystem:
+    """Struct-of-arrays particles: one list per column, live particles packed
+    into slots [0, count). Slots are reused and columns only ever grow, so a
+    warmed-up system allocates no particle storage. Subclasses list their
+    COLUMNS and move and compact all particles in a single update() pass.
+    (Plain lists rather than array.array: indexing an array boxes and unboxes
+    every value, which makes these per-slot loops 2-3x slower.)"""
 
-    def update(self):
-        self.life -= 1
-        self.y += 0.2
+    COLUMNS = ()
 
-    def is_done(self):
-        return self.life <= 0
+    def __init__(self, capacity=16):
+        self.count = 0
+        self.capacity = capacity
+        for name in self.COLUMNS:
+            setattr(self, name, [0] * capacity)
 
-    def get_char(self):
-        idx = min(3, (15 - self.life) // 4)
-        return self.chars[idx]
+    def __len__(self):
+        return self.count
 
+    def clear(self):
+        self.count = 0
 
-class LavaBlob:
-    def __init__(self, horizontal=False):
-        self.horizontal = horizontal
-        if horizontal:
-            self.x = SCREEN_COLS + random.randint(0, 5)
-            self.y = random.randint(5, SCREEN_ROWS - 3)
-            self.speed = random.uniform(0.3, 0.6)
-        else:
-            self.x = random.randint(0, SCREEN_COLS - 1)
-            self.y = SCREEN_ROWS + random.randint(0, 5)
-            self.speed = random.uniform(0.1, 0.3)
-        self.wobble = random.uniform(0, math.pi * 2)
-        self.wobble_speed = random.uniform(0.05, 0.15)
-        self.size = random.choice([1, 2, 3])
-        self.color = random.choice(PSYCHEDELIC_COLORS)
-        if self.size == 1:
-            self.char = "o"
-        elif self.size == 2:
-            self.char = "O"
-        else:
-            self.char = "@"
+    def alloc(self):
+        """Returns the index of a new slot at the end, doubling the columns when full"""
+        i = self.count
+        if i == self.capacity:
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column.extend(column)
+            self.capacity *= 2
+        self.count = i + 1
+        return i
 
-    def update(self):
-        self.wobble += self.wobble_speed
-        if self.horizontal:
-            self.x -= self.speed
-            self.y += math.sin(self.wobble) * 0.3
-        else:
-            self.y -= self.speed
-            self.x += math.sin(self.wobble) * 0.3
 
-    def is_off_screen(self):
-        if self.horizontal:
-            return self.x < -2
-        return self.y < -2
+FART_PUFF_LIFE = 15
+FART_PUFF_GLYPHS = b"~o*."
 
 
-class Snowflake:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_COLS - 1)
-        self.y = random.randint(-10, 0)
-        self.speed = random.uniform(0.05, 0.15)
-        self.drift = random.uniform(-0.02, 0.02)
-        self.char = random.choice(['*', '.', '+', 'o'])
+class FartPuffs(ParticleSystem):
+    """Puffs sinking below the player, changing glyph as they age"""
+
+    COLUMNS = ("x", "y", "life")
+
+    def emit(self, x, y):
+        i = self.alloc()
+        self.x[i] = x
+        self.y[i] = y
+        self.life[i] = FART_PUFF_LIFE
 
     def update(self):
-        self.y += self.speed
-        self.x += self.drift
-        if self.x < 0:
-            self.x = SCREEN_COLS - 1
-        elif self.x >= SCREEN_COLS:
-            self.x = 0
+        x, y, life = self.x, self.y, self.life
+        w = 0
+        for i in range(self.count):
+            left = life[i] - 1
+            if left <= 0:
+                continue
+            x[w] = x[i]
+            y[w] = y[i] + 0.2
+            life[w] = left
+            w += 1
+        self.count = w
+
+    def draw(self, fb, cam_y, color, depth):
+        x, y, life = self.x, self.y, self.life
+        data = fb.data
+        for i in range(self.count):
+            px, py = int(x[i]), int(y[i]) - cam_y
+            if 0 <= px < SCREEN_COLS and 0 <= py < SCREEN_ROWS:
+                j = py * SCREEN_COLS + px
+                data[j] = FART_PUFF_GLYPHS[min(3, (FART_PUFF_LIFE - life[i]) // 4)]
+                data[COLOR_PLANE + j] = color
+                data[DEPTH_PLANE + j] = depth
+
+
+class LavaBlobs(ParticleSystem):
+    """Acid-mode blobs drifting in from the right or rising from the bottom,
+    wobbling across their direction of travel"""
+
+    COLUMNS = ("x", "y", "speed", "wobble", "wobble_speed", "horizontal", "glyph", "color")
+
+    def emit(self, horizontal, rng):
+        i = self.alloc()
+        self.horizontal[i] = horizontal
+        if horizontal:
+            self.x[i] = SCREEN_COLS + rng.randint(0, 5)
+            self.y[i] = rng.randint(5, SCREEN_ROWS - 3)
+            self.speed[i] = rng.uniform(0.3, 0.6)
+        else:
+            self.x[i] = rng.randint(0, SCREEN_COLS - 1)
+            self.y[i] = SCREEN_ROWS + rng.randint(0, 5)
+            self.speed[i] = rng.uniform(0.1, 0.3)
+        self.wobble[i] = rng.uniform(0, math.pi * 2)
+        self.wobble_speed[i] = rng.uniform(0.05, 0.15)
+        self.glyph[i] = rng.choice(b"oO@")  # Size 1-3
+        self.color[i] = rng.choice(PSYCHEDELIC_INDICES)
 
-    def is_off_screen(self):
-        return self.y >= SCREEN_ROWS
+    def update(self):
+        x, y, speed, wobble, wobble_speed = self.x, self.y, self.speed, self.wobble, self.wobble_speed
+        horizontal, glyph, color = self.horizontal, self.glyph, self.color
+        sin = math.sin
+        w = 0
+        for i in range(self.count):
+            phase = wobble[i] + wobble_speed[i]
+            if horizontal[i]:
+                px = x[i] - speed[i]
+                if px < -2:
+                    continue
+                py = y[i] + sin(phase) * 0.3
+            else:
+                py = y[i] - speed[i]
+                if py < -2:
+                    continue
+                px = x[i] + sin(phase) * 0.3
+            x[w] = px
+            y[w] = py
+            wobble[w] = phase
+            if w != i:
+                speed[w] = speed[i]
+                wobble_speed[w] = wobble_speed[i]
+                horizontal[w] = horizontal[i]
+                glyph[w] = glyph[i]
+                color[w] = color[i]
+            w += 1
+        self.count = w
+
+    def draw(self, fb, cam_y, depth):
+        x, y, glyph, color = self.x, self.y, self.glyph, self.color
+        data = fb.data
+        for i in range(self.count):
+            px, py = int(x[i]), int(y[i]) - cam_y
+            if 0 <= px < SCREEN_COLS and 0 <= py < SCREEN_ROWS:
+                j = py * SCREEN_COLS + px
+                data[j] = glyph[i]
+                data[COLOR_PLANE + j] = color[i]
+                data[DEPTH_PLANE + j] = depth
+
+
+class Snowflakes(ParticleSystem):
+    """Snow falling with a slight sideways drift that wraps around the screen"""
+
+    COLUMNS = ("x", "y", "speed", "drift", "glyph")
+
+    def emit(self, rng):
+        i = self.alloc()
+        self.x[i] = rng.randint(0, SCREEN_COLS - 1)
+        self.y[i] = rng.randint(-10, 0)
+        self.speed[i] = rng.uniform(0.05, 0.15)
+        self.drift[i] = rng.uniform(-0.02, 0.02)
+        self.glyph[i] = rng.choice(b"*.+o")
+
+    def update(self):
+        x, y, speed, drift, glyph = self.x, self.y, self.speed, self.drift, self.glyph
+        w = 0
+        for i in range(self.count):
+            py = y[i] + speed[i]
+            if py >= SCREEN_ROWS:
+                continue
+            px = x[i] + drift[i]
+            if px < 0:
+                px = SCREEN_COLS - 1
+            elif px >= SCREEN_COLS:
+                px = 0
+            x[w] = px
+            y[w] = py
+            if w != i:
+                speed[w] = speed[i]
+                drift[w] = drift[i]
+                glyph[w] = glyph[i]
+            w += 1
+        self.count = w
+
+    def draw(self, fb, cam_y, color, depth, rng=None):
+        """With rng, every visible flake gets its own psychedelic color"""
+        x, y, glyph = self.x, self.y, self.glyph
+        data = fb.data
+        for i in range(self.count):
+            px, py = int(x[i]), int(y[i]) - cam_y
+            if 0 <= px < SCREEN_COLS and 0 <= py < SCREEN_ROWS:
+                j = py * SCREEN_COLS + px
+                data[j] = glyph[i]
+                data[COLOR_PLANE + j] = rng.choice(PSYCHEDELIC_INDICES) if rng else color
+                data[DEPTH_PLANE + j] = depth
 
 
 class BackgroundElement:
+    __slots__ = ("type", "x", "speed", "char", "y", "color", "sprite", "width", "height")
+
     def __init__(self, element_type, x):
         self.type = element_type
         self.x = x
@@ -391,11 +952,11 @@ class BackgroundElement:
         if element_type == "mountain":
             self.char = MOUNTAIN_CHAR
             self.y = 6  # High up
-            self.color = (100, 100, 120)
+            self.color = MOUNTAIN_COLOR
         elif element_type == "small_mountain":
             self.char = SMALL_MOUNTAIN_CHAR
             self.y = 8
-            self.color = (80, 80, 100)
+            self.color = SMALL_MOUNTAIN_COLOR
         elif element_type == "snowman":
             self.char = SNOWMAN_CHAR
             self.y = 8
@@ -403,12 +964,13 @@ class BackgroundElement:
         elif element_type == "snow_drift":
             self.char = SNOW_DRIFT_CHAR
             self.y = 10
-            self.color = (220, 220, 240)
+            self.color = SNOW_DRIFT_COLOR
         else:
             self.char = SMALL_MOUNTAIN_CHAR
             self.y = 8
             self.color = GRAY
 
+        self.sprite = get_sprite(self.char)
         self.width = max(len(row) for row in self.char)
         self.height = len(self.char)
 
@@ -420,14 +982,17 @@ class BackgroundElement:
 
 
 class Powerup:
-    def __init__(self, x, powerup_type):
+    __slots__ = ("x", "type", "char", "sprite", "color", "height", "width", "y")
+
+    def __init__(self, x, powerup_type, rng=random):
         self.x = x
         self.type = powerup_type
         self.char = POWERUP_CHARS[powerup_type]
+        self.sprite = get_sprite(self.char)
         self.color = POWERUP_COLORS[powerup_type]
         self.height = len(self.char)
         self.width = len(self.char[0])
-        self.y = GROUND_HEIGHT - self.height - random.randint(0, 8)
+        self.y = GROUND_HEIGHT - self.height - rng.randint(0, 8)
 
     def update(self, scroll_speed):
         self.x -= scroll_speed
@@ -542,17 +1107,20 @@ class Player:
 
 
 class Obstacle:
-    def __init__(self, x, obstacle_type="easy"):
+    __slots__ = ("x", "obstacle_type", "flying", "char", "fly_y", "sprite", "height", "width", "y", "alive")
+
+    def __init__(self, x, obstacle_type="easy", rng=random):
         self.x = x
         self.obstacle_type = obstacle_type
         self.flying = False
+        self.fly_y = 0
 
         if obstacle_type == "easy":
-            self.char = random.choice(OBSTACLE_CHARS_EASY)
+            self.char = rng.choice(OBSTACLE_CHARS_EASY)
         elif obstacle_type == "bird":
             self.char = BIRD_CHAR
             self.flying = True
-            self.fly_y = random.randint(8, 14)
+            self.fly_y = rng.randint(8, 14)
         elif obstacle_type == "cow":
             self.char = COW_CHAR
         elif obstacle_type == "house":
@@ -562,8 +1130,9 @@ class Obstacle:
         elif obstacle_type == "spike":
             self.char = SPIKE_CHAR
         else:
-            self.char = random.choice(OBSTACLE_CHARS_EASY)
+            self.char = rng.choice(OBSTACLE_CHARS_EASY)
 
+        self.sprite = get_sprite(self.char, solid=True)
         self.height = len(self.char)
         self.width = max(len(row) for row in self.char)
 
@@ -581,113 +1150,457 @@ class Obstacle:
     def is_off_screen(self):
         return self.x + self.width < 0
 
+    def is_dead(self):
+        return not self.alive
+
+
+class EntityPool:
+    """Free list of one entity class. acquire() re-runs __init__ on a recycled
+    instance when one is available, so steady-state play allocates nothing."""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.state = operator.attrgetter(*cls.__slots__)
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.__init__(*args)
+            return obj
+        self.created += 1
+        return self.cls(*args)
+
+    def release_all(self, items):
+        self.free.extend(items)
+
+    def save(self, items):
+        """Slot values of each item, as a tuple of tuples"""
+        return tuple(map(self.state, items))
+
+    def load(self, states, items):
+        """Recycles items and returns entities holding the save() states. Slots
+        are set directly: re-running __init__ would draw from the game's RNG."""
+        self.free.extend(items)
+        free = self.free
+        cls = self.cls
+        slots = cls.__slots__
+        loaded = []
+        for state in states:
+            if free:
+                obj = free.pop()
+            else:
+                self.created += 1
+                obj = object.__new__(cls)
+            for name, value in zip(slots, state):
+                setattr(obj, name, value)
+            loaded.append(obj)
+        return loaded
+
+    def sweep(self, items, gone):
+        """Returns the items for which gone(item) is false, recycling the rest"""
+        kept = []
+        for item in items:
+            if gone(item):
+                self.free.append(item)
+            else:
+                kept.append(item)
+        return kept
+
+
+def drop_front(items, gone, pool=None):
+    """Delete the leading items for which gone(item) is true, in place, handing
+    them back to pool. For lists whose expired entries collect at the front."""
+    n = 0
+    for item in items:
+        if not gone(item):
+            break
+        n += 1
+    if n:
+        if pool is not None:
+            pool.free.extend(items[:n])
+        del items[:n]
+
+
+def pick_obstacle_type(score, rng):
+    """Roll the type of the next obstacle - harder types unlock as score grows"""
+    obstacle_type = "easy"
+    if score > 300:
+        r = rng.random()
+        if r < 0.15:
+            obstacle_type = "cactus"
+        elif r < 0.25:
+            obstacle_type = "spike"
+    if score > 800:
+        r = rng.random()
+        if r < 0.15:
+            obstacle_type = "bird"
+        elif r < 0.25:
+            obstacle_type = "cactus"
+        elif r < 0.35:
+            obstacle_type = "spike"
+    if score > 1500:
+        r = rng.random()
+        if r < 0.12:
+            obstacle_type = "bird"
+        elif r < 0.22:
+            obstacle_type = "cow"
+        elif r < 0.32:
+            obstacle_type = "cactus"
+        elif r < 0.40:
+            obstacle_type = "spike"
+    if score > 2500:
+        r = rng.random()
+        if r < 0.08:
+            obstacle_type = "bird"
+        elif r < 0.16:
+            obstacle_type = "cow"
+        elif r < 0.24:
+            obstacle_type = "house"
+        elif r < 0.32:
+            obstacle_type = "cactus"
+        elif r < 0.40:
+            obstacle_type = "spike"
+    return obstacle_type
+
+
+def obstacle_spawn_delay(scroll_speed, width, rng):
+    """Frames until the next obstacle - always leaves room to land and jump again"""
+    jump_distance = JUMP_DURATION * scroll_speed
+    landing_buffer = 8
+    min_distance = jump_distance + width + landing_buffer
+    min_frames = int(min_distance / max(scroll_speed, 0.1))
+    random_extra = int(min_frames * rng.uniform(0.1, 0.5))
+    return min_frames + random_extra
+
+
+# Replay encoding: magic, seed, frame count, score, then per input a varint
+# frame delta followed by the input mask byte
+REPLAY_MAGIC = b"ARR1"
+REPLAY_HEADER = struct.Struct("<4sQII")
+MAX_SEED = (1 << 64) - 1  # Seeds are stored as an unsigned 64-bit field
+
+
+class Replay:
+    """A recorded run: the seed plus every input mask, stamped with the value of
+    GameEngine.frame when it was applied. Enough to re-simulate the run exactly."""
+
+    def __init__(self, seed, inputs=None, frames=0, score=0):
+        self.seed = seed
+        self.inputs = inputs if inputs is not None else []  # [(frame, mask), ...]
+        self.frames = frames
+        self.score = score
+
+    def record(self, frame, mask):
+        self.inputs.append((frame, mask))
+
+    def to_bytes(self):
+        out = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, self.seed, self.frames, self.score))
+        last = 0
+        for frame, mask in self.inputs:
+            delta = frame - last
+            while delta >= 0x80:
+                out.append(delta & 0x7F | 0x80)
+                delta >>= 7
+            out.append(delta)
+            out.append(mask)
+            last = frame
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decodes to_bytes() output. Raises ValueError for anything else,
+        including a replay cut short."""
+        if len(data) < REPLAY_HEADER.size:
+            raise ValueError("corrupt replay: %d bytes is shorter than the header" % len(data))
+        magic, seed, frames, score = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("not an ASCII Runner replay")
+        inputs = []
+        frame = 0
+        pos = REPLAY_HEADER.size
+        try:
+            while pos < len(data):
+                delta = shift = 0
+                while True:
+                    byte = data[pos]
+                    pos += 1
+                    delta |= (byte & 0x7F) << shift
+                    shift += 7
+                    if byte < 0x80:
+                        break
+                frame += delta
+                inputs.append((frame, data[pos]))
+                pos += 1
+        except IndexError:
+            raise ValueError("corrupt replay: input %d is truncated" % len(inputs)) from None
+        return cls(seed, inputs, frames, score)
+
+    def to_string(self):
+        """Base64 form, for storing next to a high score"""
+        return binascii.b2a_base64(self.to_bytes(), newline=False).decode("ascii")
+
+    @classmethod
+    def from_string(cls, text):
+        return cls.from_bytes(binascii.a2b_base64(text))
+
+    def verify(self):
+        """Re-simulate the run headlessly and check that it reaches the recorded
+        frame count and score. Returns the outcome with a "valid" flag."""
+        engine = GameEngine(self.seed)
+        valid = True
+        for frame, mask in self.inputs:
+            if frame > engine.frame:
+                engine.step_many(frame - engine.frame)
+            # Inputs must be in order and land on a frame the game was still running
+            if engine.frame != frame or engine.game_over:
+                valid = False
+                break
+            engine.apply_input(mask)
+        if valid and self.frames > engine.frame:
+            engine.step_many(self.frames - engine.frame)
+
+        return {
+            "valid": valid and engine.frame == self.frames and engine.score == self.score,
+            "score": engine.score,
+            "frames": engine.frame,
+            "game_over": engine.game_over,
+        }
+
+
+PERF_WINDOW = 600  # Samples kept per phase - 10 seconds of 60Hz frames
+PERF_PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class PhaseProfiler:
+    """Rolling per-phase timings in nanoseconds. start() opens a frame, each
+    mark(phase) records the time since the previous mark (or start) into that
+    phase's ring buffer of the last `window` samples."""
+
+    def __init__(self, window=PERF_WINDOW):
+        self.window = window
+        self.rings = {}
+        self.counts = {}
+        self.last = 0
+
+    def start(self):
+        self.last = time.perf_counter_ns()
+        return self.last
+
+    def mark(self, phase):
+        now = time.perf_counter_ns()
+        self.record(phase, now - self.last)
+        self.last = now
+
+    def record(self, phase, ns):
+        n = self.counts.get(phase, 0)
+        if n == 0:
+            self.rings[phase] = [0] * self.window
+        self.rings[phase][n % self.window] = ns
+        self.counts[phase] = n + 1
+
+    def stats(self):
+        """Per phase: sample count, last, mean, p50/p95/p99 and max, in microseconds"""
+        stats = {}
+        for phase, ring in self.rings.items():
+            n = self.counts[phase]
+            samples = sorted(ring[:min(n, self.window)])
+            k = len(samples)
+            phase_stats = {
+                "samples": k,
+                "last": ring[(n - 1) % self.window] / 1000,
+                "mean": sum(samples) / k / 1000,
+                "max": samples[-1] / 1000,
+            }
+            for name, q in PERF_PERCENTILES:
+                phase_stats[name] = samples[min(k - 1, int(k * q))] / 1000
+            stats[phase] = phase_stats
+        return stats
+
+
+# What GameEngine.snapshot() keeps: everything later frames of the game depend
+# on. Cosmetics (particles, background elements, stars, cosmetic_rng) are left
+# alone by restore(); x, width and height never change on the player.
+ENGINE_STATE = (
+    "seed", "frame", "score", "high_score", "game_over", "death_type", "spawn_timer", "powerup_timer",
+    "scroll_speed", "kills", "stopwatch_timer", "stopwatch_speed_reduction",
+    "scroll_offset", "bg_scroll_offset", "camera_y",
+)
+PLAYER_STATE = (
+    "y", "vel_y", "jumps_left", "on_ground", "jetpack_jumps", "has_beans", "beans_timer", "ammo",
+    "acid_timer", "acid_flash_timer", "nirvana_flash_timer", "was_in_nirvana", "grace_period",
+)
+get_engine_state = operator.attrgetter(*ENGINE_STATE)
+get_player_state = operator.attrgetter(*PLAYER_STATE)
+
+REWIND_SNAPSHOTS = 300
+REWIND_INTERVAL = 6  # Frames between rewind snapshots: 300 of them cover 30 seconds
+
+
+class RewindBuffer:
+    """Ring of the last `capacity` (frame, snapshot) pairs, one every `interval` frames"""
+
+    def __init__(self, capacity=REWIND_SNAPSHOTS, interval=REWIND_INTERVAL):
+        self.capacity = capacity
+        self.interval = interval
+        self.clear()
+
+    def clear(self):
+        self.ring = [None] * self.capacity
+        self.count = 0  # Snapshots ever recorded; ring[(count - 1) % capacity] is the newest
+        self.size = 0  # Snapshots still held
+
+    def record(self, engine):
+        if engine.frame % self.interval == 0:
+            self.ring[self.count % self.capacity] = (engine.frame, engine.snapshot())
+            self.count += 1
+            self.size = min(self.size + 1, self.capacity)
+
+    def rewind(self, engine, frames):
+        """Restores the newest snapshot at least `frames` frames before the
+        engine's current frame (or the oldest held) and drops the ones after
+        it. Returns the frame restored to, or None when the ring is empty."""
+        target = engine.frame - frames
+        ring = self.ring
+        capacity = self.capacity
+        while self.size:
+            frame, snap = ring[(self.count - 1) % capacity]
+            if frame <= target or self.size == 1:
+                engine.restore(snap)
+                return frame
+            ring[(self.count - 1) % capacity] = None
+            self.count -= 1
+            self.size -= 1
+        return None
+
 
 class GameEngine:
     """Core game logic - platform independent"""
 
-    def __init__(self):
-        self.reset()
+    def __init__(self, seed=None):
+        # Render targets are allocated by the first render (see alloc_render_buffers),
+        # so engines that only simulate - replay checks, server sessions - stay small
+        self.framebuffer = None
+        self.layers = None  # Cached render layers ...
+        self.layer_keys = {"sky": None, "far_background": None}  # ... and the inputs they were drawn from
+        self.tick_buffer = None  # tick(): header plus packed frame
+        self.pools = {
+            "obstacle": EntityPool(Obstacle),
+            "powerup": EntityPool(Powerup),
+            "bullet": EntityPool(Bullet),
+            "background_element": EntityPool(BackgroundElement),
+        }
+        self.obstacles = []
+        self.powerups = []
+        self.bullets = []
+        self.background_elements = []
+        self.fart_puffs = FartPuffs()
+        self.lava_blobs = LavaBlobs()
+        self.snowflakes = Snowflakes()
+        self.tick_collected = []  # Reused by tick() for the pickups of one tick
+        # PhaseProfiler while enable_profiling() is on; None costs one check per phase
+        self.profiler = None
+        self.rewind_buffer = None  # RewindBuffer while enable_rewind() is on
+        self.reset(seed)
         self.high_score = 0
+
+    def reset(self, seed=None):
+        """Start a new game. Without a seed a fresh one is drawn; either way it is
+        kept in self.seed so the run can be replayed."""
+        if seed is None:
+            seed = random.getrandbits(32)
+        elif not 0 <= seed <= MAX_SEED:
+            # Caught here rather than when the finished run's replay is saved
+            raise ValueError("seed must be between 0 and %d, got %r" % (MAX_SEED, seed))
+        self.seed = seed
+        # Gameplay (spawns, powerup heights, bean farts) and cosmetics (stars,
+        # particles, psychedelic colors) draw from separate streams, so whether
+        # frames get rendered never changes what happens in the game
+        self.rng = random.Random(seed)
+        self.cosmetic_rng = random.Random("cosmetic:%d" % seed)
+        self.replay = Replay(seed)
+        self.snapshot_inputs = (None, ())  # See replay_inputs()
         self.frame = 0
 
-    def reset(self):
+        self.prev_frame = None  # Last frame sent by get_screen_diff (None = full redraw)
+        self.prev_camera_y = 0
         self.player = Player()
+        # Hand the previous game's entities back to their pools
+        for name, entities in self.live_entities().items():
+            self.pools[name].release_all(entities)
         self.obstacles = []
         self.powerups = []
         self.bullets = []
-        self.fart_puffs = []
-        self.lava_blobs = []
-        self.snowflakes = []
         self.background_elements = []
+        self.fart_puffs.clear()
+        self.lava_blobs.clear()
+        self.snowflakes.clear()
         self.score = 0
         self.game_over = False
+        self.death_type = None  # obstacle_type of what ended the run
         self.spawn_timer = 180
         self.spawn_delay = 40
         self.powerup_timer = 120
         self.bg_element_timer = 0
         self.scroll_speed = BASE_SCROLL_SPEED
+        self.kills = 0  # Obstacles marked dead since the last cull
         self.stopwatch_timer = 0
         self.stopwatch_speed_reduction = 0
         self.scroll_offset = 0.0  # Track world scroll for ground/background
         self.bg_scroll_offset = 0.0  # Slower scroll for background parallax
         self.camera_y = 0  # Vertical camera offset (negative = looking up)
 
-        # Generate starfield (two screen heights above)
-        self.stars = []
-        for _ in range(100):
-            star_x = random.randint(0, SCREEN_COLS - 1)
-            star_y = random.randint(-SCREEN_ROWS * 2, -1)  # Above the screen
-            star_char = random.choice(['.', '*', '+', 'o'])
-            star_brightness = random.choice([(100, 100, 120), (150, 150, 180), (200, 200, 255), (255, 255, 255)])
-            self.stars.append((star_x, star_y, star_char, star_brightness))
+        # advance(): unsimulated time, and how far rendering is between the state
+        # before the last step (prev_*) and the current one
+        self.time_accumulator = 0.0
+        self.alpha = 1.0
+        self.prev_player_y = self.player.y
+        self.prev_camera_y_step = self.camera_y
+        if self.rewind_buffer:
+            self.rewind_buffer.clear()
+
+        # Generate starfield (two screen heights above). Stored compactly as
+        # (band row, x, glyph, color) byte records sorted by row - band row 0 is
+        # -STAR_BAND - with star_starts[r] the first record of band row r, so
+        # the sky layer only touches the rows the camera can see
+        rng = self.cosmetic_rng
+        records = []
+        for _ in range(STAR_COUNT):
+            star_x = rng.randint(0, SCREEN_COLS - 1)
+            star_y = rng.randint(-STAR_BAND, -1)  # Above the screen
+            star_char = rng.choice(['.', '*', '+', 'o'])
+            star_brightness = rng.choice(STAR_COLORS)
+            records.append((star_y + STAR_BAND, star_x, ord(star_char), PALETTE_INDEX[star_brightness]))
+        records.sort(key=lambda record: record[0])
+        self.stars = bytes(value for record in records for value in record)
+        self.star_starts = bytes(bisect.bisect_left(records, (row,)) for row in range(STAR_BAND + 1))
+        self.layer_keys = {"sky": None, "far_background": None}
 
         # Initialize some background elements
         for i in range(3):
-            x = i * 30 + random.randint(0, 10)
-            element_type = random.choice(["mountain", "small_mountain"])
-            self.background_elements.append(BackgroundElement(element_type, x))
+            x = i * 30 + rng.randint(0, 10)
+            element_type = rng.choice(["mountain", "small_mountain"])
+            self.background_elements.append(self.pools["background_element"].acquire(element_type, x))
 
     def spawn_obstacle(self):
         if self.spawn_timer <= 0:
-            obstacle_type = "easy"
-            if self.score > 300:
-                r = random.random()
-                if r < 0.15:
-                    obstacle_type = "cactus"
-                elif r < 0.25:
-                    obstacle_type = "spike"
-            if self.score > 800:
-                r = random.random()
-                if r < 0.15:
-                    obstacle_type = "bird"
-                elif r < 0.25:
-                    obstacle_type = "cactus"
-                elif r < 0.35:
-                    obstacle_type = "spike"
-            if self.score > 1500:
-                r = random.random()
-                if r < 0.12:
-                    obstacle_type = "bird"
-                elif r < 0.22:
-                    obstacle_type = "cow"
-                elif r < 0.32:
-                    obstacle_type = "cactus"
-                elif r < 0.40:
-                    obstacle_type = "spike"
-            if self.score > 2500:
-                r = random.random()
-                if r < 0.08:
-                    obstacle_type = "bird"
-                elif r < 0.16:
-                    obstacle_type = "cow"
-                elif r < 0.24:
-                    obstacle_type = "house"
-                elif r < 0.32:
-                    obstacle_type = "cactus"
-                elif r < 0.40:
-                    obstacle_type = "spike"
-
-            new_obstacle = Obstacle(SCREEN_COLS, obstacle_type)
+            obstacle_type = pick_obstacle_type(self.score, self.rng)
+            new_obstacle = self.pools["obstacle"].acquire(SCREEN_COLS, obstacle_type, self.rng)
             self.obstacles.append(new_obstacle)
-
-            jump_distance = JUMP_DURATION * self.scroll_speed
-            landing_buffer = 8
-            min_distance = jump_distance + new_obstacle.width + landing_buffer
-            min_frames = int(min_distance / max(self.scroll_speed, 0.1))
-            random_extra = int(min_frames * random.uniform(0.1, 0.5))
-            self.spawn_timer = min_frames + random_extra
+            self.spawn_timer = obstacle_spawn_delay(self.scroll_speed, new_obstacle.width, self.rng)
         else:
             self.spawn_timer -= 1
 
     def spawn_powerup(self):
         self.powerup_timer -= 1
         if self.powerup_timer <= 0:
-            powerup_type = random.choice([POWERUP_PISTOL, POWERUP_JETPACK, POWERUP_BEANS, POWERUP_ACID, POWERUP_STOPWATCH])
-            self.powerups.append(Powerup(SCREEN_COLS, powerup_type))
-            self.powerup_timer = random.randint(80, 180)
+            powerup_type = self.rng.choice(POWERUP_TYPES)
+            self.powerups.append(self.pools["powerup"].acquire(SCREEN_COLS, powerup_type, self.rng))
+            self.powerup_timer = self.rng.randint(80, 180)
 
     def check_collision(self):
-        """Check for collisions. Returns (collision, stomped) tuple."""
+        """Check for collisions. Returns (obstacle hit or None, stomped) tuple."""
         px, py = int(self.player.x), int(self.player.y)
         player_width, player_height = self.player.width, self.player.height
 
@@ -699,13 +1612,18 @@ class GameEngine:
         player_bottom = py + player_height
 
         stomped = False
+        player_right = px + player_width
 
+        # Obstacles are in x order: stop at the first one starting past the player
         for obs in self.obstacles:
+            ox = int(obs.x)
+            if ox >= player_right:
+                break
             if not obs.alive:
                 continue
-            ox, oy = int(obs.x), int(obs.y)
+            oy = int(obs.y)
 
-            if px < ox + obs.width and px + player_width > ox:
+            if px < ox + obs.width:
                 if py < oy + obs.height and player_bottom > oy:
                     # Check if landing on top
                     landing_on_top = player_bottom <= oy + 3 and self.player.vel_y >= 0
@@ -714,6 +1632,7 @@ class GameEngine:
                         # Stomp organic enemies (Mario-style)
                         if obs.obstacle_type in ORGANIC_OBSTACLES:
                             obs.alive = False
+                            self.kills += 1
                             self.player.stomp_bounce()
                             stomped = True
                             continue
@@ -726,23 +1645,25 @@ class GameEngine:
                             continue
 
                     # Regular collision - death
-                    return (True, stomped)
+                    return (obs, stomped)
 
-        return (False, stomped)
+        return (None, stomped)
 
     def check_powerup_collision(self):
         px, py = int(self.player.x), int(self.player.y)
         player_width, player_height = self.player.width, self.player.height
         collected = []
 
-        for powerup in self.powerups[:]:
+        # Powerups are in x order: stop at the first one starting past the player
+        for powerup in self.powerups:
             ox, oy = int(powerup.x), int(powerup.y)
+            if ox >= px + player_width:
+                break
             if (px < ox + powerup.width and
-                px + player_width > ox and
                 py < oy + powerup.height and
                 py + player_height > oy):
 
-                collected.append(powerup.type)
+                collected.append(powerup)
 
                 if powerup.type == POWERUP_JETPACK:
                     self.player.jetpack_jumps += 10
@@ -759,27 +1680,65 @@ class GameEngine:
                     self.stopwatch_timer = 300
                     self.stopwatch_speed_reduction = self.scroll_speed * 0.6
 
-                self.powerups.remove(powerup)
-
+        if collected:
+            self.powerups = [p for p in self.powerups if p not in collected]
+            self.pools["powerup"].release_all(collected)
+            collected = [p.type for p in collected]
         return collected
 
     def check_bullet_hits(self):
-        for bullet in self.bullets[:]:
+        if not self.bullets or not self.obstacles:
+            return
+        # Broad phase: obstacles are in x order, so only those starting in
+        # (bx - MAX_OBSTACLE_WIDTH, bx] can contain a bullet at column bx
+        obstacles = self.obstacles
+        starts = [int(obs.x) for obs in obstacles]
+        spent = []
+        for bullet in self.bullets:
             bx, by = int(bullet.x), int(bullet.y)
-            for obs in self.obstacles:
+            lo = bisect.bisect_right(starts, bx - MAX_OBSTACLE_WIDTH)
+            hi = bisect.bisect_right(starts, bx)
+            for i in range(lo, hi):
+                obs = obstacles[i]
                 if not obs.alive:
                     continue
-                ox, oy = int(obs.x), int(obs.y)
-                if (bx >= ox and bx < ox + obs.width and
+                oy = int(obs.y)
+                if (bx < starts[i] + obs.width and
                     by >= oy and by < oy + obs.height):
                     obs.alive = False
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
+                    self.kills += 1
+                    spent.append(bullet)
                     break
+        if spent:
+            self.bullets = [b for b in self.bullets if b not in spent]
+            self.pools["bullet"].release_all(spent)
+
+    def apply_input(self, mask):
+        """Apply an INPUT_FIRE | INPUT_JUMP mask before the next frame, firing first
+        like a button press does, and record it in the replay.
+        Returns the mask of actions that actually happened."""
+        if self.game_over or not mask:
+            return 0
+        self.replay.record(self.frame, mask)
+        done = 0
+        if mask & INPUT_FIRE and self.fire_weapon():
+            done |= INPUT_FIRE
+        if mask & INPUT_JUMP and self.player.jump():
+            done |= INPUT_JUMP
+        return done
+
+    def get_replay(self):
+        """The current run as a Replay, stamped with its frame count and score"""
+        self.replay.frames = self.frame
+        self.replay.score = self.score
+        return self.replay
+
+    def get_replay_string(self):
+        return self.get_replay().to_string()
 
     def fire_weapon(self):
         if self.player.ammo > 0:
-            self.bullets.append(Bullet(self.player.x + self.player.width, self.player.y + 1))
+            self.bullets.append(self.pools["bullet"].acquire(self.player.x + self.player.width, self.player.y + 1))
             self.player.ammo -= 1
             return True
         return False
@@ -789,19 +1748,182 @@ class GameEngine:
         if self.game_over:
             return {"game_over": True}
 
-        events = {
-            "game_over": False,
+        collected, farted, stomped = self.simulate_frame()
+
+        return {
+            "game_over": self.game_over,
             "jumped": False,
             "shot": False,
-            "died": False,
-            "farted": False,
-            "collected": [],
+            "died": self.game_over,
+            "farted": farted,
+            "collected": collected,
+            "stomped": stomped,
         }
 
+    def advance(self, dt_seconds):
+        """Advance by wall-clock time using fixed SIM_DT steps. Leftover time is
+        carried to the next call and exposed as self.alpha (0..1) for render
+        interpolation; at most MAX_CATCH_UP_STEPS run per call.
+        Returns the events of all steps merged, plus "steps"."""
+        collected = []
+        steps, farted, stomped = self.run_steps(dt_seconds, collected)
+        return {
+            "game_over": self.game_over,
+            "jumped": False,
+            "shot": False,
+            "died": self.game_over and steps > 0,
+            "farted": farted,
+            "collected": collected,
+            "stomped": stomped,
+            "steps": steps,
+        }
+
+    def run_steps(self, dt_seconds, collected):
+        """The fixed-step loop behind advance() and tick(). Appends picked up
+        powerup types to collected and returns (steps, farted, stomped)."""
+        self.time_accumulator += dt_seconds
+        steps = 0
+        farted = stomped = False
+        # Small tolerance so a display running at exactly 60Hz gets one step per frame
+        while self.time_accumulator >= SIM_DT - 1e-9 and not self.game_over:
+            if steps == MAX_CATCH_UP_STEPS:
+                self.time_accumulator %= SIM_DT
+                break
+            self.time_accumulator -= SIM_DT
+            self.prev_player_y = self.player.y
+            self.prev_camera_y_step = self.camera_y
+            step_collected, step_farted, step_stomped = self.simulate_frame()
+            steps += 1
+            if self.rewind_buffer:
+                self.rewind_buffer.record(self)
+            farted |= step_farted
+            stomped |= step_stomped
+            collected.extend(step_collected)
+
+        if self.game_over:
+            # Freeze on the final state
+            self.time_accumulator = 0.0
+            self.alpha = 1.0
+        else:
+            self.alpha = min(max(self.time_accumulator / SIM_DT, 0.0), 1.0)
+        return steps, farted, stomped
+
+    def tick(self, input_mask=0, dt_seconds=SIM_DT):
+        """One call per displayed frame: apply input_mask, advance by dt_seconds
+        and render. Returns self.tick_buffer - the same bytearray every call -
+        holding the TICK_FIELDS header (the input mask that took effect, step
+        count, events and the get_state() numbers) followed by the packed frame."""
+        inputs = self.apply_input(input_mask)
+        collected = self.tick_collected
+        del collected[:]
+        steps, farted, stomped = self.run_steps(dt_seconds, collected)
+
+        events = 0
+        if self.game_over:
+            events |= TICK_GAME_OVER
+            if steps:
+                events |= TICK_DIED
+        if farted:
+            events |= TICK_FARTED
+        if stomped:
+            events |= TICK_STOMPED
+        collected_bits = 0
+        for powerup_type in collected:
+            collected_bits |= 1 << POWERUP_TYPES.index(powerup_type)
+
+        frame = self.render_screen().data
+        player = self.player
+        buf = self.tick_buffer
+        TICK_HEADER.pack_into(
+            buf, 0,
+            inputs, steps, events, collected_bits,
+            self.score, self.high_score, self.frame, self.stopwatch_timer,
+            player.jumps_left, player.ammo, player.jetpack_jumps, player.has_beans, player.beans_timer,
+            player.acid_timer, player.get_acid_level(), player.grace_period,
+        )
+        buf[TICK_HEADER.size:] = frame
+        return buf
+
+    def snapshot(self):
+        """Captures the gameplay state as nested tuples - no entity is copied,
+        so this is cheap enough for lookahead search. restore(snap) puts it
+        back; simulating on from there replays exactly what followed the
+        snapshot given the same inputs."""
+        pools = self.pools
+        return (
+            get_engine_state(self),
+            get_player_state(self.player),
+            self.rng.getstate(),
+            pools["obstacle"].save(self.obstacles),
+            pools["powerup"].save(self.powerups),
+            pools["bullet"].save(self.bullets),
+            self.replay_inputs(),
+        )
+
+    def replay_inputs(self):
+        """The replay's inputs so far as a tuple, reused between snapshots until
+        another input is recorded"""
+        replay, inputs = self.snapshot_inputs
+        if replay is not self.replay or len(inputs) != len(replay.inputs):
+            self.snapshot_inputs = (self.replay, tuple(self.replay.inputs))
+        return self.snapshot_inputs[1]
+
+    def restore(self, snap):
+        """Returns the game to a snapshot(). The replay restarts from the inputs
+        recorded before the snapshot, so it keeps describing the restored run,
+        and the high score goes back too: one set in an abandoned branch was
+        never reached by the run being played."""
+        engine_state, player_state, rng_state, obstacles, powerups, bullets, inputs = snap
+        for name, value in zip(ENGINE_STATE, engine_state):
+            setattr(self, name, value)
+        player = self.player
+        for name, value in zip(PLAYER_STATE, player_state):
+            setattr(player, name, value)
+        self.rng.setstate(rng_state)
+        pools = self.pools
+        self.obstacles = pools["obstacle"].load(obstacles, self.obstacles)
+        self.powerups = pools["powerup"].load(powerups, self.powerups)
+        self.bullets = pools["bullet"].load(bullets, self.bullets)
+        self.replay = Replay(self.seed, list(inputs))
+        # Render interpolation restarts from the restored state
+        self.time_accumulator = 0.0
+        self.alpha = 1.0
+        self.prev_player_y = player.y
+        self.prev_camera_y_step = self.camera_y
+
+    def enable_rewind(self, enabled=True, capacity=REWIND_SNAPSHOTS, interval=REWIND_INTERVAL):
+        """Turn recording of rewind snapshots on or off. Frames stepped by
+        advance() and tick() are recorded; lookahead through simulate_frame()
+        is not."""
+        self.rewind_buffer = RewindBuffer(capacity, interval) if enabled else None
+
+    def rewind(self, frames):
+        """Go back at least `frames` frames - also out of a game over - as far as
+        the rewind buffer reaches. Returns the frame restored to, or None."""
+        if not self.rewind_buffer:
+            return None
+        return self.rewind_buffer.rewind(self, frames)
+
+    def get_tick_layout(self):
+        """Describes tick_buffer for the renderer: field names in header order,
+        the powerup type for each "collected" bit and the frame offset"""
+        return {"fields": TICK_FIELDS, "powerups": POWERUP_TYPES, "frame_offset": TICK_HEADER.size}
+
+    def simulate_frame(self, cosmetic=True):
+        """Advance the game by one frame. Returns (collected, farted, stomped) and
+        sets game_over on death. With cosmetic=False, entities that only matter for
+        rendering (fart puffs, lava blobs, snowflakes, background elements) are skipped."""
+        prof = self.profiler
+        if prof:
+            frame_start = prof.start()
         self.frame += 1
         self.player.update()
+        if prof:
+            prof.mark("player")
         self.spawn_obstacle()
         self.spawn_powerup()
+        if prof:
+            prof.mark("spawn")
 
         # Camera follows player upward
         if self.player.y < CAMERA_FOLLOW_THRESHOLD:
@@ -831,284 +1953,446 @@ class GameEngine:
             powerup.update(self.scroll_speed)
         for bullet in self.bullets:
             bullet.update()
-        for puff in self.fart_puffs:
-            puff.update()
+        if prof:
+            prof.mark("entities")
+
+        if cosmetic:
+            self.update_cosmetics()
+            if prof:
+                prof.mark("cosmetics")
+
+        # Everything spawns at a fixed column and moves in lockstep, so these
+        # lists stay in x order and expired entries collect at the front
+        # (bullets fly right: the oldest lead). Only kills need a full pass.
+        pools = self.pools
+        if self.kills:
+            self.obstacles = pools["obstacle"].sweep(self.obstacles, Obstacle.is_dead)
+            self.kills = 0
+        drop_front(self.obstacles, Obstacle.is_off_screen, pools["obstacle"])
+        drop_front(self.powerups, Powerup.is_off_screen, pools["powerup"])
+        drop_front(self.bullets, Bullet.is_off_screen, pools["bullet"])
+        if prof:
+            prof.mark("cull")
+
+        collected = self.check_powerup_collision()
+        self.check_bullet_hits()
+
+        farted = False
+        if self.player.has_beans and self.rng.random() < 0.005:
+            self.player.fart_jump()
+            if cosmetic:
+                self.fart_puffs.emit(self.player.x + self.player.width // 2, self.player.y + self.player.height)
+            farted = True
+
+        collision, stomped = self.check_collision()
+
+        if collision and not self.player.is_invincible():
+            self.game_over = True
+            self.death_type = collision.obstacle_type
+            if self.score > self.high_score:
+                self.high_score = self.score
+        else:
+            self.score += 1
+
+        if prof:
+            prof.mark("collisions")
+            prof.record("update", prof.last - frame_start)
+        return (collected, farted, stomped)
+
+    def update_cosmetics(self):
+        """Update rendering-only entities for the current frame"""
+        rng = self.cosmetic_rng
+        pools = self.pools
+        self.fart_puffs.update()
 
         if self.player.acid_timer > 0:
-            for blob in self.lava_blobs:
-                blob.update()
-            if random.random() < 0.15:
-                horizontal = random.random() < 0.5
-                self.lava_blobs.append(LavaBlob(horizontal=horizontal))
-            self.lava_blobs = [b for b in self.lava_blobs if not b.is_off_screen()]
+            self.lava_blobs.update()
+            if rng.random() < 0.15:
+                self.lava_blobs.emit(rng.random() < 0.5, rng)
         else:
-            self.lava_blobs = []
+            self.lava_blobs.clear()
 
         # Update snowflakes in snow environment
         env_name = get_environment_for_score(self.score)
         if env_name == "snow":
-            for flake in self.snowflakes:
-                flake.update()
-            self.snowflakes = [f for f in self.snowflakes if not f.is_off_screen()]
+            self.snowflakes.update()
             # Spawn new snowflakes
-            if len(self.snowflakes) < 30 and random.random() < 0.1:
-                self.snowflakes.append(Snowflake())
+            if len(self.snowflakes) < 30 and rng.random() < 0.1:
+                self.snowflakes.emit(rng)
         else:
-            self.snowflakes = []
+            self.snowflakes.clear()
 
         # Update background elements
         for elem in self.background_elements:
             elem.update(self.scroll_speed)
-        self.background_elements = [e for e in self.background_elements if not e.is_off_screen()]
+        self.background_elements = pools["background_element"].sweep(self.background_elements,
+                                                                     BackgroundElement.is_off_screen)
 
         # Spawn new background elements
         self.bg_element_timer -= 1
         if self.bg_element_timer <= 0:
             if env_name == "snow":
-                element_type = random.choice(["mountain", "small_mountain", "snowman", "snow_drift"])
+                element_type = rng.choice(["mountain", "small_mountain", "snowman", "snow_drift"])
             elif env_name == "desert":
-                element_type = random.choice(["small_mountain"])
+                element_type = rng.choice(["small_mountain"])
             else:
-                element_type = random.choice(["mountain", "small_mountain"])
-            self.background_elements.append(BackgroundElement(element_type, SCREEN_COLS + 5))
-            self.bg_element_timer = random.randint(200, 400)
-
-        self.obstacles = [obs for obs in self.obstacles if not obs.is_off_screen() and obs.alive]
-        self.powerups = [p for p in self.powerups if not p.is_off_screen()]
-        self.bullets = [b for b in self.bullets if not b.is_off_screen()]
-        self.fart_puffs = [p for p in self.fart_puffs if not p.is_done()]
-
-        events["collected"] = self.check_powerup_collision()
-        self.check_bullet_hits()
+                element_type = rng.choice(["mountain", "small_mountain"])
+            self.background_elements.append(pools["background_element"].acquire(element_type, SCREEN_COLS + 5))
+            self.bg_element_timer = rng.randint(200, 400)
+
+    def step_many(self, n, inputs=None):
+        """Headless fast-forward: simulate up to n frames without cosmetic entities.
+        inputs maps a frame number to an INPUT_JUMP | INPUT_FIRE mask, applied when
+        self.frame equals that number, i.e. before the next frame is simulated.
+        Stops early on game over. Returns aggregated events."""
+        frames = jumps = shots = farts = stomps = 0
+        collected = {}
+        simulate_frame = self.simulate_frame
+
+        while frames < n and not self.game_over:
+            if inputs:
+                action = inputs.get(self.frame)
+                if action:
+                    done = self.apply_input(action)
+                    if done & INPUT_FIRE:
+                        shots += 1
+                    if done & INPUT_JUMP:
+                        jumps += 1
+
+            got, farted, stomped = simulate_frame(False)
+            frames += 1
+            if got:
+                for powerup_type in got:
+                    collected[powerup_type] = collected.get(powerup_type, 0) + 1
+            if farted:
+                farts += 1
+            if stomped:
+                stomps += 1
 
-        if self.player.has_beans and random.random() < 0.005:
-            self.player.fart_jump()
-            self.fart_puffs.append(FartPuff(self.player.x + self.player.width // 2, self.player.y + self.player.height))
-            events["farted"] = True
-
-        collision, stomped = self.check_collision()
-        events["stomped"] = stomped
-
-        if collision and not self.player.is_invincible():
-            self.game_over = True
-            events["died"] = True
-            events["game_over"] = True
-            if self.score > self.high_score:
-                self.high_score = self.score
-        else:
-            self.score += 1
-
-        return events
+        return {
+            "frames": frames,
+            "game_over": self.game_over,
+            "death_type": self.death_type,
+            "score": self.score,
+            "jumps": jumps,
+            "shots": shots,
+            "farts": farts,
+            "stomps": stomps,
+            "collected": collected,
+        }
 
-    def get_screen_buffer(self):
-        """Returns 2D array of (char, color, depth) tuples
-        Depth: 0 = far background (smallest), 1 = mid background, 2 = foreground (largest)"""
-        screen = [[(' ', BLACK, 2) for _ in range(SCREEN_COLS)] for _ in range(SCREEN_ROWS)]
+    def alloc_render_buffers(self):
+        """Creates the framebuffer, cached layers and tick buffer - done by the
+        first render. Returns the framebuffer."""
+        self.framebuffer = FrameBuffer()
+        self.layers = {"sky": FrameBuffer(), "far_background": FrameBuffer()}
+        self.layer_keys = {"sky": None, "far_background": None}
+        self.tick_buffer = bytearray(TICK_HEADER.size + len(BLANK_FRAME))
+        return self.framebuffer
+
+    def render_screen(self):
+        """Draws the playfield into the packed framebuffer and returns it.
+
+        Layers, back to front: sky (stars, sun/moon) and far background
+        (parallax mountains) are cached and only re-rasterized when their
+        inputs change; mid terrain, foreground and overlays are drawn on top
+        every frame."""
+        fb = self.framebuffer or self.alloc_render_buffers()
+        rng = self.cosmetic_rng
+        prof = self.profiler
+        if prof:
+            frame_start = prof.start()
+
+        # Interpolate between the state before the last step and the current one:
+        # back is how much of that step to undo (0 outside of advance())
+        back = 1.0 - self.alpha
+        scroll_back = self.scroll_speed * back
 
         # Camera offset for vertical scrolling
-        cam_y = int(self.camera_y)
+        cam_y = int(self.camera_y - (self.camera_y - self.prev_camera_y_step) * back)
 
         env_name = get_environment_for_score(self.score)
-        env = ENVIRONMENTS[env_name]
+        acid = self.player.acid_timer > 0
+
+        self.render_sky(cam_y, env_name)
+        if prof:
+            prof.mark("render_sky")
+        fb.data[:] = self.render_far_background(cam_y, scroll_back, acid, rng).data
+        if prof:
+            prof.mark("render_far_background")
+        self.render_mid_terrain(fb, cam_y, env_name, scroll_back, acid, rng)
+        if prof:
+            prof.mark("render_mid_terrain")
+        self.render_foreground(fb, cam_y, back, scroll_back, acid, rng)
+        if prof:
+            prof.mark("render_foreground")
+        self.render_overlays(fb)
+        if prof:
+            prof.mark("render_overlays")
 
-        # Draw stars (visible when camera looks up)
-        for star_x, star_y, star_char, star_color in self.stars:
-            screen_y = star_y - cam_y
-            if 0 <= screen_y < SCREEN_ROWS and 0 <= star_x < SCREEN_COLS:
-                screen[screen_y][star_x] = (star_char, star_color, 0)
+        # Emoji mode
+        if self.player.get_acid_level() == 2:
+            fb.map_glyphs(EMOJI_TABLE)
+        if prof:
+            prof.mark("render_emoji")
+            prof.record("render", prof.last - frame_start)
+
+        return fb
 
-        # Draw sun or moon based on day cycle (score-based) - depth 0 (far)
+    def render_sky(self, cam_y, env_name):
+        """Sky layer: stars and sun/moon - depth 0 (far). Re-rasterized only
+        when the camera row, day/night phase or cave-ness changes."""
         is_day = (self.score // 500) % 2 == 0
-        if env_name != "cave":  # No sun/moon in caves
+        show_sun = env_name != "cave"  # No sun/moon in caves
+        key = (cam_y, is_day, show_sun)
+        layer = self.layers["sky"]
+        if self.layer_keys["sky"] == key:
+            return layer
+        self.layer_keys["sky"] = key
+        layer.clear()
+
+        # Stars (visible when camera looks up) - only rows inside the view
+        stars, starts = self.stars, self.star_starts
+        data = layer.data
+        for star_y in range(max(cam_y, -STAR_BAND), min(cam_y + SCREEN_ROWS, 0)):
+            row = star_y + STAR_BAND
+            for k in range(starts[row] * 4, starts[row + 1] * 4, 4):
+                i = (star_y - cam_y) * SCREEN_COLS + stars[k + 1]
+                data[i] = stars[k + 2]
+                data[COLOR_PLANE + i] = stars[k + 3]
+                data[DEPTH_PLANE + i] = 0
+
+        # Sun or moon based on day cycle (score-based)
+        if show_sun:
             if is_day:
-                sun_x = 65
-                sun_y = 1 - cam_y
-                sun_color = YELLOW
-                for i, row in enumerate(SUN_CHAR):
-                    for j, char in enumerate(row):
-                        x, y = sun_x + j, sun_y + i
-                        if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                            screen[y][x] = (char, sun_color, 0)
+                layer.blit(get_sprite(SUN_CHAR), 65, 1 - cam_y, PALETTE_INDEX[YELLOW], 0)
             else:
-                moon_x = 65
-                moon_y = 1 - cam_y
-                moon_color = (200, 200, 220)
-                for i, row in enumerate(MOON_CHAR):
-                    for j, char in enumerate(row):
-                        x, y = moon_x + j, moon_y + i
-                        if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                            screen[y][x] = (char, moon_color, 0)
-
-        # Draw background elements (mountains, snowmen) - depth 0 (far)
+                layer.blit(get_sprite(MOON_CHAR), 65, 1 - cam_y, PALETTE_INDEX[MOON_COLOR], 0)
+        return layer
+
+    def render_far_background(self, cam_y, scroll_back, acid, rng):
+        """Far background layer: the sky plus parallax mountains and snowmen -
+        depth 0 (far). They move a column every few dozen frames, so the layer
+        is only redrawn when the sky or an element's cell position or color changes."""
+        placed = []
         for elem in self.background_elements:
-            color = elem.color
-            if self.player.acid_timer > 0:
-                color = random.choice(PSYCHEDELIC_COLORS)
-            for i, row in enumerate(elem.char):
-                for j, char in enumerate(row):
-                    x, y = int(elem.x) + j, elem.y + i - cam_y
-                    if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                        screen[y][x] = (char, color, 0)
-
-        # Draw snowflakes - depth 1 (mid)
-        for flake in self.snowflakes:
-            x, y = int(flake.x), int(flake.y) - cam_y
-            if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS:
-                flake_color = WHITE
-                if self.player.acid_timer > 0:
-                    flake_color = random.choice(PSYCHEDELIC_COLORS)
-                screen[y][x] = (flake.char, flake_color, 1)
-
-        # Draw lava blobs - depth 1 (mid)
-        for blob in self.lava_blobs:
-            x, y = int(blob.x), int(blob.y) - cam_y
-            if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS:
-                screen[y][x] = (blob.char, blob.color, 1)
-
-        # Background terrain - depth 1 (mid)
-        BG_TERRAIN_TOP = 12
-        BG_TERRAIN_BOTTOM = 17
-
-        bg_color = env["bg_color"]
-        bg_chars = env["bg_chars"]
-        if self.player.acid_timer > 0:
-            bg_color = random.choice(PSYCHEDELIC_COLORS)
+            color = PALETTE_INDEX[elem.color]
+            if acid:
+                color = rng.choice(PSYCHEDELIC_INDICES)
+            placed.append((elem.sprite, int(elem.x + scroll_back * elem.speed), elem.y - cam_y, color))
+        key = (self.layer_keys["sky"], placed)
+        layer = self.layers["far_background"]
+        if self.layer_keys["far_background"] == key:
+            return layer
+        self.layer_keys["far_background"] = key
+        layer.data[:] = self.layers["sky"].data
+        for sprite, x, y, color in placed:
+            layer.blit(sprite, x, y, color, 0)
+        return layer
+
+    def render_mid_terrain(self, fb, cam_y, env_name, scroll_back, acid, rng):
+        """Mid layer: snow, lava blobs and scrolling terrain - depth 1 (mid), ground at depth 2"""
+        env = ENVIRONMENTS[env_name]
+
+        # Draw snowflakes
+        self.snowflakes.draw(fb, cam_y, PALETTE_INDEX[WHITE], 1, rng if acid else None)
+
+        # Draw lava blobs
+        self.lava_blobs.draw(fb, cam_y, 1)
+
+        # Background terrain
+        terrain = get_terrain(env_name)
+        bg_color = PALETTE_INDEX[env["bg_color"]]
+        if acid:
+            bg_color = rng.choice(PSYCHEDELIC_INDICES)
 
         # Use scroll offset for background (slower parallax)
-        bg_offset = int(self.bg_scroll_offset)
-        for x in range(SCREEN_COLS):
-            height_offset = ((x + bg_offset) // 8) % 3 - 1
-            terrain_top = BG_TERRAIN_TOP + height_offset - cam_y
-            if 0 <= terrain_top < SCREEN_ROWS:
-                char = bg_chars[(x + bg_offset) % len(bg_chars)]
-                screen[terrain_top][x] = (char, bg_color, 1)
-
-        # Fill - scrolling fill pattern - depth 1 (mid)
-        fill_color = env["fill_color"]
-        fill_char = env["fill_char"]
-        fill_chars = [fill_char, '.', fill_char, ':']  # Varied pattern for movement
-        if self.player.acid_timer > 0:
-            fill_color = random.choice(PSYCHEDELIC_COLORS)
+        bg_offset = int(self.bg_scroll_offset - scroll_back * 0.3)
+        fb.blit(terrain.bg_sprite, -(bg_offset % terrain.bg_period), BG_TERRAIN_TOP - 1 - cam_y, bg_color, 1)
+
+        # Fill - scrolling fill pattern
+        fill_color = PALETTE_INDEX[env["fill_color"]]
+        if acid:
+            fill_color = rng.choice(PSYCHEDELIC_INDICES)
 
-        fill_offset = int(self.scroll_offset * 0.5)
+        fill_offset = int((self.scroll_offset - scroll_back) * 0.5)
         for y in range(BG_TERRAIN_BOTTOM, GROUND_HEIGHT):
             screen_y = y - cam_y
             if 0 <= screen_y < SCREEN_ROWS:
-                for x in range(SCREEN_COLS):
-                    char = fill_chars[(x + fill_offset + y) % len(fill_chars)]
-                    screen[screen_y][x] = (char, fill_color, 1)
+                start = (fill_offset + y) % terrain.fill_period
+                fb.row(screen_y, terrain.fill_strip[start:start + SCREEN_COLS], fill_color, 1)
 
         # Ground - scrolling at full speed - depth 2 (foreground)
-        ground_color = env["ground_color"]
-        ground_chars = env["ground_chars"]
-        if self.player.acid_timer > 0:
-            ground_color = random.choice(PSYCHEDELIC_COLORS)
-        ground_offset = int(self.scroll_offset)
+        ground_color = PALETTE_INDEX[env["ground_color"]]
+        if acid:
+            ground_color = rng.choice(PSYCHEDELIC_INDICES)
+        ground_offset = int(self.scroll_offset - scroll_back)
         ground_screen_y = GROUND_HEIGHT - cam_y
         if 0 <= ground_screen_y < SCREEN_ROWS:
-            for x in range(SCREEN_COLS):
-                char = ground_chars[(x + ground_offset) % len(ground_chars)]
-                screen[ground_screen_y][x] = (char, ground_color, 2)
+            start = ground_offset % terrain.ground_period
+            fb.row(ground_screen_y, terrain.ground_strip[start:start + SCREEN_COLS], ground_color, 2)
 
-        # Obstacles - depth 2 (foreground)
+    def render_foreground(self, fb, cam_y, back, scroll_back, acid, rng):
+        """Foreground layer: obstacles, powerups, puffs, bullets and the player - depth 2"""
+        # Obstacles
         for obs in self.obstacles:
             if not obs.alive:
                 continue
-            obs_color = RED
-            if self.player.acid_timer > 0:
-                obs_color = random.choice(PSYCHEDELIC_COLORS)
-            for i, row in enumerate(obs.char):
-                for j, char in enumerate(row):
-                    x, y = int(obs.x) + j, int(obs.y) + i - cam_y
-                    if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS:
-                        if char == ' ':
-                            screen[y][x] = (' ', BLACK, 2)
-                        else:
-                            screen[y][x] = (char, obs_color, 2)
-
-        # Powerups - depth 2 (foreground)
+            obs_color = PALETTE_INDEX[RED]
+            if acid:
+                obs_color = rng.choice(PSYCHEDELIC_INDICES)
+            # Solid sprite: spaces inside the obstacle overwrite with BLACK
+            fb.blit(obs.sprite, int(obs.x + scroll_back), int(obs.y) - cam_y, obs_color, 2)
+
+        # Powerups
         for powerup in self.powerups:
-            for i, row in enumerate(powerup.char):
-                for j, char in enumerate(row):
-                    x, y = int(powerup.x) + j, int(powerup.y) + i - cam_y
-                    if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS:
-                        screen[y][x] = (char, powerup.color, 2)
-
-        # Fart puffs - depth 2 (foreground)
-        for puff in self.fart_puffs:
-            x, y = int(puff.x), int(puff.y) - cam_y
-            if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS:
-                screen[y][x] = (puff.get_char(), LIME, 2)
-
-        # Bullets - depth 2 (foreground)
+            fb.blit(powerup.sprite, int(powerup.x + scroll_back), int(powerup.y) - cam_y, PALETTE_INDEX[powerup.color], 2)
+
+        # Fart puffs
+        self.fart_puffs.draw(fb, cam_y, PALETTE_INDEX[LIME], 2)
+
+        # Bullets
+        bullet_color = PALETTE_INDEX[ORANGE]
+        bullet_sprite = get_sprite(BULLET_CHAR)
         for bullet in self.bullets:
-            x, y = int(bullet.x), int(bullet.y) - cam_y
-            for i, char in enumerate(bullet.char):
-                if 0 <= x + i < SCREEN_COLS and 0 <= y < SCREEN_ROWS:
-                    screen[y][x + i] = (char, ORANGE, 2)
-
-        # Rainbow eye during nirvana - depth 2 (foreground)
-        acid_level = self.player.get_acid_level()
-        if acid_level == 3:
+            fb.blit(bullet_sprite, int(bullet.x - bullet.speed * back), int(bullet.y) - cam_y, bullet_color, 2)
+
+        # Rainbow eye during nirvana
+        player_y = int(self.player.y - (self.player.y - self.prev_player_y) * back)
+        if self.player.get_acid_level() == 3:
             eye_width = len(RAINBOW_EYE[0])
             eye_x = int(self.player.x) + (self.player.width // 2) - (eye_width // 2)
-            eye_y = int(self.player.y) - 1 - cam_y
-
-            for i, row in enumerate(RAINBOW_EYE):
-                for j, char in enumerate(row):
-                    x, y = eye_x + j, eye_y + i
-                    if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                        color_idx = (i + j + self.frame // 3) % len(PSYCHEDELIC_COLORS)
-                        screen[y][x] = (char, PSYCHEDELIC_COLORS[color_idx], 2)
+            eye_y = player_y - 1 - cam_y
+            fb.blit(get_sprite(RAINBOW_EYE), eye_x, eye_y, 0, 2, phase=self.frame // 3)
 
-        # Player - depth 2 (foreground)
-        player_color = CYAN
-        if self.player.acid_timer > 0:
-            player_color = PSYCHEDELIC_COLORS[self.frame % len(PSYCHEDELIC_COLORS)]
+        # Player
+        player_color = PALETTE_INDEX[CYAN]
+        if acid:
+            player_color = PSYCHEDELIC_INDICES[self.frame % len(PSYCHEDELIC_INDICES)]
         # Flash during grace period
         if self.player.grace_period > 0 and (self.frame // 4) % 2 == 0:
-            player_color = WHITE
-        player_char = self.player.get_char(self.frame)
-        for i, row in enumerate(player_char):
-            for j, char in enumerate(row):
-                x, y = int(self.player.x) + j, int(self.player.y) + i - cam_y
-                if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                    screen[y][x] = (char, player_color, 2)
-
-        # Flash text - depth 2 (foreground)
+            player_color = PALETTE_INDEX[WHITE]
+        player_sprite = get_sprite(self.player.get_char(self.frame))
+        fb.blit(player_sprite, int(self.player.x), player_y - cam_y, player_color, 2)
+
+    def render_overlays(self, fb):
+        """Overlay layer: acid / nirvana flash text, fixed to the screen - depth 2"""
         if self.player.acid_flash_timer > 0:
-            flash_text = ACID_FLASH_TEXT
             flash_y = 2
-            flash_x = (SCREEN_COLS - len(flash_text[0])) // 2
+            flash_x = (SCREEN_COLS - len(ACID_FLASH_TEXT[0])) // 2
             if self.player.acid_flash_timer % 6 < 3:
-                for i, row in enumerate(flash_text):
-                    for j, char in enumerate(row):
-                        x, y = flash_x + j, flash_y + i
-                        if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                            color = PSYCHEDELIC_COLORS[(i + j + self.frame) % len(PSYCHEDELIC_COLORS)]
-                            screen[y][x] = (char, color, 2)
+                fb.blit(get_sprite(ACID_FLASH_TEXT), flash_x, flash_y, 0, 2, phase=self.frame)
 
         if self.player.nirvana_flash_timer > 0:
-            flash_text = NIRVANA_FLASH_TEXT
             flash_y = 2
-            flash_x = (SCREEN_COLS - len(flash_text[0])) // 2
+            flash_x = (SCREEN_COLS - len(NIRVANA_FLASH_TEXT[0])) // 2
             if self.player.nirvana_flash_timer % 6 < 3:
-                for i, row in enumerate(flash_text):
-                    for j, char in enumerate(row):
-                        x, y = flash_x + j, flash_y + i
-                        if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                            color = PSYCHEDELIC_COLORS[(i + j + self.frame) % len(PSYCHEDELIC_COLORS)]
-                            screen[y][x] = (char, color, 2)
+                fb.blit(get_sprite(NIRVANA_FLASH_TEXT), flash_x, flash_y, 0, 2, phase=self.frame)
 
-        # Emoji mode
-        if acid_level == 2:
-            for y in range(SCREEN_ROWS):
-                for x in range(SCREEN_COLS):
-                    char, color, depth = screen[y][x]
-                    if char in EMOJI_CHARS:
-                        screen[y][x] = (EMOJI_CHARS[char], color, depth)
+    def live_entities(self):
+        """Entity lists by pool name"""
+        return {
+            "obstacle": self.obstacles,
+            "powerup": self.powerups,
+            "bullet": self.bullets,
+            "background_element": self.background_elements,
+        }
 
-        return screen
+    def get_pool_stats(self):
+        """Live, pooled and ever-created counts per entity kind (for particle
+        systems: used, spare and total slots). Once play reaches a steady state
+        "created" stops growing."""
+        live = self.live_entities()
+        stats = {
+            name: {"live": len(live[name]), "pooled": len(pool.free), "created": pool.created}
+            for name, pool in self.pools.items()
+        }
+        for name, particles in (("fart_puff", self.fart_puffs), ("lava_blob", self.lava_blobs),
+                                ("snowflake", self.snowflakes)):
+            stats[name] = {"live": particles.count, "pooled": particles.capacity - particles.count,
+                           "created": particles.capacity}
+        return stats
+
+    def enable_profiling(self, enabled=True, window=PERF_WINDOW):
+        """Turn per-phase timing of simulate_frame() and render_screen() on or
+        off. Turning it on starts from empty ring buffers of `window` frames."""
+        self.profiler = PhaseProfiler(window) if enabled else None
+
+    def get_perf_stats(self):
+        """Per-phase timings (see PhaseProfiler.stats) plus live entity counts.
+        "update" and "render" are whole-frame totals; phases is empty while
+        profiling is off."""
+        return {
+            "enabled": self.profiler is not None,
+            "phases": self.profiler.stats() if self.profiler else {},
+            "entities": {name: stats["live"] for name, stats in self.get_pool_stats().items()},
+        }
+
+    def get_screen_buffer(self):
+        """Returns 2D array of (char, color, depth) tuples
+        Depth: 0 = far background (smallest), 1 = mid background, 2 = foreground (largest)"""
+        return self.render_screen().to_tuples()
+
+    def get_packed_screen_buffer(self):
+        """Returns the packed framebuffer bytes (see FrameBuffer) - same object every frame"""
+        return self.render_screen().data
+
+    def get_screen_spans(self):
+        """Returns each row as (depth, color_index, start_col, text) spans, so a
+        renderer can draw one string per span instead of one glyph per cell"""
+        return self.render_screen().to_spans()
+
+    def get_palette(self):
+        """Returns the RGB color for each palette index used in packed buffers"""
+        return PALETTE
+
+    def get_screen_diff(self):
+        """Returns (full_frame, runs) with only the cells changed since the last call.
+        Each run is (row, col, text, color, depth) covering adjacent changed cells
+        that share color and depth. After reset() or a camera jump full_frame is True:
+        the renderer should clear the screen and the runs cover every non-blank cell."""
+        data = self.render_screen().data
+        cam_y = int(self.camera_y)
+
+        full_frame = self.prev_frame is None or cam_y != self.prev_camera_y
+        prev = BLANK_FRAME if full_frame else self.prev_frame
+
+        runs = []
+        for y in range(SCREEN_ROWS):
+            start = y * SCREEN_COLS
+            end = start + SCREEN_COLS
+            glyphs = data[start:end]
+            colors = data[COLOR_PLANE + start:COLOR_PLANE + end]
+            depths = data[DEPTH_PLANE + start:DEPTH_PLANE + end]
+            prev_glyphs = prev[start:end]
+            prev_colors = prev[COLOR_PLANE + start:COLOR_PLANE + end]
+            prev_depths = prev[DEPTH_PLANE + start:DEPTH_PLANE + end]
+            if glyphs == prev_glyphs and colors == prev_colors and depths == prev_depths:
+                continue
+            run_x = -1
+            run_color = None
+            run_depth = None
+            for x in range(SCREEN_COLS):
+                color = colors[x]
+                depth = depths[x]
+                if glyphs[x] == prev_glyphs[x] and color == prev_colors[x] and depth == prev_depths[x]:
+                    if run_x >= 0:
+                        runs.append((y, run_x, glyphs[run_x:x].decode('ascii'), PALETTE[run_color], run_depth))
+                        run_x = -1
+                    continue
+                if run_x >= 0 and color == run_color and depth == run_depth:
+                    continue
+                if run_x >= 0:
+                    runs.append((y, run_x, glyphs[run_x:x].decode('ascii'), PALETTE[run_color], run_depth))
+                run_x = x
+                run_color = color
+                run_depth = depth
+            if run_x >= 0:
+                runs.append((y, run_x, glyphs[run_x:].decode('ascii'), PALETTE[run_color], run_depth))
+
+        self.prev_frame = bytes(data)
+        self.prev_camera_y = cam_y
+        return (full_frame, runs)
 
     def get_state(self):
         """Get current game state for serialization"""
@@ -1130,85 +2414,11 @@ class GameEngine:
             "frame": self.frame,
         }
 
-    def get_game_over_buffer(self):
-        """Returns game over screen with Gates of Hell"""
-        screen = [[(' ', BLACK, 2) for _ in range(SCREEN_COLS)] for _ in range(SCREEN_ROWS)]
-
-        flame_chars = ['^', 'W', 'M', '*', '~', 'v', 'A']
-
-        # Fill background with dark red gradient
-        for y in range(SCREEN_ROWS):
-            for x in range(SCREEN_COLS):
-                if random.random() < 0.1:
-                    darkness = 50 + int(y * 3)
-                    screen[y][x] = ('.', (darkness, 0, 0), 2)
-
-        # Gates of Hell - centered
-        gates_width = len(GATES_OF_HELL[0]) if GATES_OF_HELL else 0
-        gates_x = (SCREEN_COLS - gates_width) // 2
-        gates_y = 0
-
-        for i, row in enumerate(GATES_OF_HELL):
-            for j, char in enumerate(row):
-                x, y = gates_x + j, gates_y + i
-                if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS:
-                    if char != ' ':
-                        # Color based on character type
-                        if char in '()':
-                            # Flames coming from gates - animated
-                            if random.random() < 0.7:
-                                color = random.choice([RED, ORANGE, YELLOW, (255, 50, 0)])
-                            else:
-                                color = (255, 200, 0)
-                        elif char == '^':
-                            # Rising flames
-                            color = random.choice([ORANGE, YELLOW, RED])
-                        elif char in 'ABANDONALLHOPE':
-                            # Title text - ominous glow
-                            if random.random() < 0.9:
-                                color = (200, 0, 0)
-                            else:
-                                color = (255, 100, 0)
-                        elif char in '|_/\\':
-                            # Gate structure - dark iron
-                            if random.random() < 0.85:
-                                color = (80, 80, 90)
-                            else:
-                                color = (120, 60, 0)  # Rust
-                        elif char == 'o':
-                            # Player head
-                            color = CYAN
-                        else:
-                            # Default gate color
-                            color = (100, 100, 110)
-                        screen[y][x] = (char, color, 2)
-
-        # Draw player figure in front of gates (centered at bottom of gate opening)
-        player_x = SCREEN_COLS // 2 - 1
-        player_y = 19
-        for i, row in enumerate(DEATH_PLAYER):
-            for j, char in enumerate(row):
-                x, y = player_x + j, player_y + i
-                if 0 <= x < SCREEN_COLS and 0 <= y < SCREEN_ROWS and char != ' ':
-                    screen[y][x] = (char, CYAN, 2)
-
-        # Animated flames pouring out from gate opening
-        gate_center = SCREEN_COLS // 2
-        for _ in range(40):
-            fx = gate_center + random.randint(-8, 8)
-            fy = random.randint(8, 18)
-            if 0 <= fx < SCREEN_COLS and 0 <= fy < SCREEN_ROWS:
-                char = random.choice(flame_chars)
-                color = random.choice([RED, ORANGE, YELLOW, (255, 100, 0)])
-                # Only draw if not overwriting important stuff
-                if screen[fy][fx][0] in ' .':
-                    screen[fy][fx] = (char, color, 2)
-
-        # Ground - charred earth
-        for x in range(SCREEN_COLS):
-            char = random.choice(['#', '=', '_', '~'])
-            color = (40, 20, 10) if random.random() < 0.7 else (60, 30, 0)
-            screen[SCREEN_ROWS - 3][x] = (char, color, 2)
+    def render_game_over(self):
+        """Draws the game over screen with Gates of Hell into the packed framebuffer"""
+        fb = self.framebuffer or self.alloc_render_buffers()
+        get_game_over_screen().draw(fb, self.cosmetic_rng)
+        ci = PALETTE_INDEX
 
         # Score display - bottom of screen
         score_text = f"Score: {self.score}  High: {self.high_score}"
@@ -1217,14 +2427,18 @@ class GameEngine:
         score_x = (SCREEN_COLS - len(score_text)) // 2
         restart_x = (SCREEN_COLS - len(restart_text)) // 2
 
-        for i, char in enumerate(score_text):
-            if 0 <= score_x + i < SCREEN_COLS:
-                screen[SCREEN_ROWS - 2][score_x + i] = (char, (150, 150, 150), 2)
+        fb.text(score_x, SCREEN_ROWS - 2, score_text, ci[GRAY], 2)
 
         # Blinking restart text
         if (self.frame // 30) % 2 == 0:
-            for i, char in enumerate(restart_text):
-                if 0 <= restart_x + i < SCREEN_COLS:
-                    screen[SCREEN_ROWS - 1][restart_x + i] = (char, CYAN, 2)
+            fb.text(restart_x, SCREEN_ROWS - 1, restart_text, ci[CYAN], 2)
 
-        return screen
+        return fb
+
+    def get_game_over_buffer(self):
+        """Returns game over screen with Gates of Hell"""
+        return self.render_game_over().to_tuples()
+
+    def get_packed_game_over_buffer(self):
+        """Returns the packed framebuffer bytes for the game over screen"""
+        return self.render_game_over().data
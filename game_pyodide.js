@@ -8,6 +8,12 @@ let ctx = null;
 let animationId = null;
 let audioContext = null;
 
+// Playfield is kept on an offscreen canvas; only changed cells are redrawn
+let frameCanvas = null;
+let frameCtx = null;
+let lastFrame = null;  // Copy of the packed frame currently on frameCanvas
+let paletteCSS = [];   // Palette index -> CSS fillStyle, built once from the engine palette
+
 // Game state
 let gameState = 'loading'; // loading, intro, playing, gameover, highscore
 let highScores = [];
@@ -37,6 +43,10 @@ const BLUE = '#6464ff';
 
 const PSYCHEDELIC_COLORS = [MAGENTA, CYAN, PINK, PURPLE, ORANGE, LIME, YELLOW, RED, BLUE];
 
+// Input flags (INPUT_JUMP / INPUT_FIRE in game_engine.py)
+const INPUT_JUMP = 1;
+const INPUT_FIRE = 2;
+
 // Sound generation
 function createOscillator(frequency, duration, type = 'square', volume = 0.3) {
     if (!audioContext) return;
@@ -219,7 +229,9 @@ function isHighScore(score) {
 }
 
 function addHighScore(name, score) {
-    highScores.push({ name: name.toUpperCase(), score });
+    // Keep the run's replay so the score can be re-simulated and verified later
+    const replay = gameEngine ? gameEngine.get_replay_string() : null;
+    highScores.push({ name: name.toUpperCase(), score, replay });
     highScores.sort((a, b) => b.score - a.score);
     highScores = highScores.slice(0, 5);
     saveHighScores();
@@ -230,6 +242,55 @@ function addHighScore(name, score) {
     }
 }
 
+// Engine import: the bundle built by build_bundle.py when its hash matches the
+// game_engine.py being served (and its bytecode suits this Python), else the source
+const ENGINE_DIR = '/home/pyodide/engine';
+const ENGINE_LOADER = `
+import hashlib
+import sys
+
+def _load_engine(engine_dir):
+    with open(engine_dir + "/game_engine.py", "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    try:
+        with open(engine_dir + "/bundle/game_engine.sha256") as f:
+            bundled = f.read().strip() == digest
+    except OSError:
+        bundled = False
+    if bundled:
+        sys.path.insert(0, engine_dir + "/bundle")
+        try:
+            import game_engine
+            return "bundle"
+        except ImportError:
+            sys.path.pop(0)
+    sys.path.insert(0, engine_dir)
+    import game_engine
+    return "source"
+`;
+
+async function fetchEngineFile(name) {
+    const response = await fetch(name);
+    if (!response.ok) {
+        throw new Error(`Failed to fetch ${name}: ${response.status}`);
+    }
+    return response.arrayBuffer();
+}
+
+// Startup timeline (ms since navigation start), logged when the first frame is drawn
+const startupReport = {};
+
+function markStartup(phase) {
+    startupReport[phase] = Math.round(performance.now());
+}
+
+function finishStartupReport() {
+    markStartup('first_frame');
+    startupReport.ready_to_first_frame = startupReport.first_frame - startupReport.pyodide_ready;
+    console.table(startupReport);
+    window.startupReport = startupReport;
+}
+
 // Initialize Pyodide and game engine
 async function initGame() {
     // Show loading message
@@ -254,21 +315,30 @@ async function initGame() {
         );
 
         pyodide = await Promise.race([pyodidePromise, timeoutPromise]);
+        markStartup('pyodide_ready');
         loadingDiv.innerHTML = 'Loading game engine...';
 
-        // Fetch and load game_engine.py
-        const response = await fetch('game_engine.py');
-        if (!response.ok) {
-            throw new Error(`Failed to fetch game_engine.py: ${response.status}`);
+        // Fetch game_engine.py and its precompiled bundle into Pyodide's filesystem
+        const [engineSource, engineBundle] = await Promise.all([
+            fetchEngineFile('game_engine.py'),
+            fetchEngineFile('game_engine.zip').catch(() => null),
+        ]);
+        pyodide.FS.mkdirTree(ENGINE_DIR);
+        pyodide.FS.writeFile(`${ENGINE_DIR}/game_engine.py`, new Uint8Array(engineSource));
+        if (engineBundle) {
+            pyodide.unpackArchive(engineBundle, 'zip', {extractDir: `${ENGINE_DIR}/bundle`});
         }
-        const engineCode = await response.text();
+        markStartup('engine_fetched');
 
-        // Run the engine code
+        // Import the engine (bytecode from the bundle when it matches the source)
         loadingDiv.innerHTML = 'Initializing game...';
-        await pyodide.runPythonAsync(engineCode);
+        pyodide.runPython(ENGINE_LOADER);
+        startupReport.engine_from = pyodide.runPython(`_load_engine("${ENGINE_DIR}")`);
+        markStartup('engine_imported');
 
         // Create game instance
-        await pyodide.runPythonAsync(`game = GameEngine()`);
+        pyodide.runPython(`from game_engine import GameEngine\ngame = GameEngine()`);
+        markStartup('engine_created');
 
         gameEngine = pyodide.globals.get('game');
 
@@ -276,6 +346,9 @@ async function initGame() {
             throw new Error('Failed to create game engine instance');
         }
 
+        loadPalette();
+        loadTickLayout();
+
         // Load high scores
         loadHighScores();
 
@@ -335,6 +408,12 @@ function setupCanvas() {
     ctx = canvas.getContext('2d');
     ctx.font = '14px Consolas, "Courier New", monospace';
     ctx.textBaseline = 'top';
+
+    frameCanvas = document.createElement('canvas');
+    frameCanvas.width = SCREEN_WIDTH;
+    frameCanvas.height = SCREEN_HEIGHT;
+    frameCtx = frameCanvas.getContext('2d');
+    frameCtx.textBaseline = 'top';
 }
 
 function resizeCanvas() {
@@ -368,6 +447,8 @@ function setupInput() {
         if (e.code === 'Space') {
             e.preventDefault();
             handleAction();
+        } else if (e.code === 'Backquote') {
+            togglePerfOverlay();
         } else if (e.code === 'Escape') {
             if (gameState === 'playing' || gameState === 'gameover') {
                 gameState = 'intro';
@@ -379,9 +460,7 @@ function setupInput() {
             // Name entry
             if (e.code === 'Enter' || e.code === 'NumpadEnter') {
                 if (playerName.length > 0) {
-                    const stateProxy = gameEngine.get_state();
-                    const state = stateProxy.toJs({dict_converter: Object.fromEntries});
-                    addHighScore(playerName, state.score);
+                    addHighScore(playerName, tickState.score);
                     gameState = 'gameover';
                     scoreEntered = true;
                 }
@@ -420,13 +499,8 @@ function handleAction() {
         scoreEntered = false;
         playerName = '';
     } else if (gameState === 'playing') {
-        // Fire weapon
-        const fired = gameEngine.fire_weapon();
-        if (fired) playShootSound();
-
-        // Jump
-        const jumped = gameEngine.player.jump();
-        if (jumped) playJumpSound();
+        // Fire weapon, then jump - applied (and recorded in the replay) by the next tick
+        pendingInput |= INPUT_FIRE | INPUT_JUMP;
     } else if (gameState === 'gameover') {
         gameState = 'playing';
         gameEngine.reset();
@@ -435,9 +509,7 @@ function handleAction() {
     } else if (gameState === 'highscore') {
         // Touch to submit name if we have one
         if (playerName.length > 0) {
-            const stateProxy = gameEngine.get_state();
-            const state = stateProxy.toJs({dict_converter: Object.fromEntries});
-            addHighScore(playerName, state.score);
+            addHighScore(playerName, tickState.score);
             gameState = 'gameover';
             scoreEntered = true;
         }
@@ -454,10 +526,217 @@ function colorToCSS(color) {
     return `rgb(${r},${g},${b})`;
 }
 
+// Packed framebuffer layout (see FrameBuffer in game_engine.py)
+const FRAME_CELLS = SCREEN_ROWS * SCREEN_COLS;
+const COLOR_PLANE = FRAME_CELLS;
+const DEPTH_PLANE = FRAME_CELLS * 2;
+
+function loadPalette() {
+    const paletteProxy = gameEngine.get_palette();
+    paletteCSS = paletteProxy.toJs().map(colorToCSS);
+    paletteProxy.destroy();
+}
+
+// GameEngine.tick() buffer layout: int32 header fields, then the packed frame
+const TICK_GAME_OVER = 1;
+const TICK_DIED = 2;
+const TICK_FARTED = 4;
+const TICK_STOMPED = 8;
+let tickFields = [];
+let tickPowerups = [];
+let tickFrameOffset = 0;
+const tickState = {};  // Header of the latest tick, by field name
+let pendingInput = 0;  // INPUT_* flags waiting for the next tick
+
+function loadTickLayout() {
+    const layoutProxy = gameEngine.get_tick_layout();
+    const layout = layoutProxy.toJs({dict_converter: Object.fromEntries});
+    layoutProxy.destroy();
+    tickFields = layout.fields;
+    tickPowerups = layout.powerups;
+    tickFrameOffset = layout.frame_offset;
+    for (const name of tickFields) tickState[name] = 0;
+}
+
+// Run one engine tick: a single call into Python, then the header is read
+// into tickState and the frame drawn straight from the returned buffer
+function runTick(dtSeconds) {
+    const input = pendingInput;
+    pendingInput = 0;
+    const bufferProxy = gameEngine.tick(input, dtSeconds);
+    const view = bufferProxy.getBuffer('u8');
+    try {
+        const data = view.data;
+        const header = new DataView(data.buffer, data.byteOffset, tickFrameOffset);
+        for (let i = 0; i < tickFields.length; i++) {
+            tickState[tickFields[i]] = header.getInt32(i * 4, true);
+        }
+        drawPackedFrame(data.subarray(tickFrameOffset));
+    } finally {
+        view.release();
+        bufferProxy.destroy();
+    }
+    return tickState;
+}
+
+// Per-depth letterSpacing that puts each glyph of a fillText span on the
+// CHAR_WIDTH grid; null when the browser lacks ctx.letterSpacing
+let spanSpacing = null;
+
+function measureSpanSpacing() {
+    if (!('letterSpacing' in frameCtx)) return null;
+    const spacing = {};
+    for (const depth of Object.keys(DEPTH_FONTS)) {
+        frameCtx.font = DEPTH_FONTS[depth];
+        frameCtx.letterSpacing = '0px';
+        spacing[depth] = (CHAR_WIDTH - frameCtx.measureText('M').width) + 'px';
+    }
+    return spacing;
+}
+
+// Draw one span of glyphs sharing color and depth (see FrameBuffer.row_spans)
+function drawSpan(text, col, row, color, depth) {
+    const font = DEPTH_FONTS[depth] ? depth : 2;
+    const x = col * CHAR_WIDTH;
+    const y = row * CHAR_HEIGHT + (DEPTH_Y_OFFSET[font] || 0);
+    frameCtx.font = DEPTH_FONTS[font];
+    frameCtx.fillStyle = paletteCSS[color];
+    if (spanSpacing) {
+        frameCtx.letterSpacing = spanSpacing[font];
+        frameCtx.fillText(text, x, y);
+    } else {
+        for (let k = 0; k < text.length; k++) {
+            if (text[k] !== ' ') frameCtx.fillText(text[k], x + k * CHAR_WIDTH, y);
+        }
+    }
+}
+
+// Draw a packed frame onto frameCanvas, redrawing only rows that differ from
+// lastFrame. Each changed row is cleared and drawn as spans of adjacent cells
+// with the same color and depth, one fillText per span.
+function drawPackedFrame(data) {
+    if (!lastFrame) {
+        lastFrame = new Uint8Array(data.length);
+        frameCtx.fillStyle = BLACK;
+        frameCtx.fillRect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT);
+        lastFrame.fill(32, 0, COLOR_PLANE);
+        lastFrame.fill(2, DEPTH_PLANE);
+        spanSpacing = measureSpanSpacing();
+    }
+
+    for (let row = 0; row < SCREEN_ROWS; row++) {
+        const rowStart = row * SCREEN_COLS;
+        const rowEnd = rowStart + SCREEN_COLS;
+        let changed = false;
+        for (let i = rowStart; i < rowEnd; i++) {
+            if (data[i] !== lastFrame[i] ||
+                data[COLOR_PLANE + i] !== lastFrame[COLOR_PLANE + i] ||
+                data[DEPTH_PLANE + i] !== lastFrame[DEPTH_PLANE + i]) {
+                changed = true;
+                break;
+            }
+        }
+        if (!changed) continue;
+
+        frameCtx.fillStyle = BLACK;
+        frameCtx.fillRect(0, row * CHAR_HEIGHT, SCREEN_WIDTH, CHAR_HEIGHT);
+
+        // Same merge rule as FrameBuffer.row_spans in game_engine.py
+        let start = -1;
+        let end = -1;
+        let color = -1;
+        let depth = -1;
+        for (let i = rowStart; i < rowEnd; i++) {
+            if (data[i] === 32) continue;
+            const c = data[COLOR_PLANE + i];
+            const d = data[DEPTH_PLANE + i];
+            if (start >= 0 && c === color && d === depth) {
+                end = i + 1;
+                continue;
+            }
+            if (start >= 0) {
+                drawSpan(String.fromCharCode(...data.subarray(start, end)), start - rowStart, row, color, depth);
+            }
+            start = i;
+            end = i + 1;
+            color = c;
+            depth = d;
+        }
+        if (start >= 0) {
+            drawSpan(String.fromCharCode(...data.subarray(start, end)), start - rowStart, row, color, depth);
+        }
+    }
+
+    lastFrame.set(data);
+    ctx.drawImage(frameCanvas, 0, 0);
+}
+
+function drawPackedProxy(bufferProxy) {
+    const view = bufferProxy.getBuffer('u8');
+    try {
+        drawPackedFrame(view.data);
+    } finally {
+        view.release();
+        bufferProxy.destroy();
+    }
+}
+
+// Debug overlay (` key): engine per-phase timings from get_perf_stats()
+const SLOW_FRAME_MS = 12;       // Ticks slower than this are logged to the console
+const PERF_REFRESH_FRAMES = 30; // Overlay refresh interval
+let perfOverlay = false;
+let perfStats = null;
+let perfFrames = 0;
+
+function togglePerfOverlay() {
+    perfOverlay = !perfOverlay;
+    perfStats = null;
+    perfFrames = 0;
+    gameEngine.enable_profiling(perfOverlay);
+}
+
+function fetchPerfStats() {
+    const statsProxy = gameEngine.get_perf_stats();
+    perfStats = statsProxy.toJs({dict_converter: Object.fromEntries});
+    statsProxy.destroy();
+}
+
+function samplePerf(tickMs) {
+    perfFrames++;
+    if (tickMs > SLOW_FRAME_MS) {
+        fetchPerfStats();
+        const phases = Object.entries(perfStats.phases)
+            .map(([phase, stats]) => `${phase}=${stats.last.toFixed(0)}us`)
+            .join(' ');
+        console.warn(`Slow frame: ${tickMs.toFixed(1)}ms`, phases, perfStats.entities);
+    } else if (perfFrames % PERF_REFRESH_FRAMES === 0) {
+        fetchPerfStats();
+    }
+}
+
+function renderPerfOverlay() {
+    if (!perfStats) return;
+    const lines = ['phase                    p50    p95    p99 us'];
+    for (const [phase, stats] of Object.entries(perfStats.phases)) {
+        lines.push(phase.padEnd(22) + [stats.p50, stats.p95, stats.p99]
+            .map((v) => v.toFixed(0).padStart(7)).join(''));
+    }
+    lines.push(Object.entries(perfStats.entities).map(([name, n]) => `${name}:${n}`).join(' '));
+
+    ctx.font = '10px Consolas, "Courier New", monospace';
+    ctx.fillStyle = 'rgba(0, 0, 0, 0.75)';
+    const top = SCREEN_HEIGHT - lines.length * 12 - 8;
+    ctx.fillRect(0, top, SCREEN_WIDTH, lines.length * 12 + 8);
+    ctx.fillStyle = LIME;
+    lines.forEach((line, i) => {
+        ctx.fillText(line, 6, top + 4 + i * 12);
+    });
+}
+
 let lastDied = false;
 let frame = 0;
 
-// Fixed timestep for consistent speed across platforms
+// Fixed timestep for menu animations (gameplay steps inside GameEngine.advance)
 const TARGET_FPS = 60;
 const FRAME_TIME = 1000 / TARGET_FPS;
 let lastTime = 0;
@@ -467,76 +746,89 @@ function gameLoop(currentTime) {
     try {
         // Calculate delta time
         if (lastTime === 0) lastTime = currentTime;
-        const deltaTime = Math.min(currentTime - lastTime, 100); // Cap at 100ms to prevent spiral
+        const deltaTime = currentTime - lastTime;
         lastTime = currentTime;
-        accumulator += deltaTime;
-
-        // Only update at fixed timestep
-        let updated = false;
-        while (accumulator >= FRAME_TIME) {
-            frame++;
-            accumulator -= FRAME_TIME;
-            updated = true;
-        }
 
-        // Skip rendering if no update occurred
-        if (!updated) {
-            animationId = requestAnimationFrame(gameLoop);
-            return;
-        }
+        if (gameState === 'playing') {
+            // The engine runs fixed 60Hz steps and interpolates between them,
+            // so tick on every display refresh; one call returns events, HUD
+            // state and the frame
+            const tickStart = performance.now();
+            const tick = runTick(deltaTime / 1000);
+            if (perfOverlay) {
+                samplePerf(performance.now() - tickStart);
+            }
+            frame += tick.steps;
 
-        if (gameState === 'intro') {
-            renderIntro();
-            playMusic(0);
-        } else if (gameState === 'playing') {
-            // Update game - convert Pyodide proxy to JS object
-            const eventsProxy = gameEngine.update();
-            const events = eventsProxy.toJs({dict_converter: Object.fromEntries});
+            if (tick.inputs & INPUT_FIRE) playShootSound();
+            if (tick.inputs & INPUT_JUMP) playJumpSound();
 
             // Play sounds based on events
-            if (events.died && !lastDied) {
+            const died = (tick.events & TICK_DIED) !== 0;
+            if (died && !lastDied) {
                 playDeathSound();
 
                 // Check for high score
-                const stateProxy = gameEngine.get_state();
-                const state = stateProxy.toJs({dict_converter: Object.fromEntries});
-                if (isHighScore(state.score)) {
+                if (isHighScore(tick.score)) {
                     gameState = 'highscore';
                 } else {
                     gameState = 'gameover';
                     scoreEntered = true;
                 }
             }
-            lastDied = events.died || false;
+            lastDied = died;
 
-            if (events.farted) {
+            if (tick.events & TICK_FARTED) {
                 playFartSound();
             }
 
-            if (events.stomped) {
+            if (tick.events & TICK_STOMPED) {
                 playStompSound();
             }
 
-            const collected = events.collected || [];
-            for (const powerupType of collected) {
+            for (let i = 0; i < tickPowerups.length; i++) {
+                if (!(tick.collected & (1 << i))) continue;
                 playPickupSound();
-                if (powerupType === 'acid') {
+                if (tickPowerups[i] === 'acid') {
                     playAcidSound();
-                } else if (powerupType === 'stopwatch') {
+                } else if (tickPowerups[i] === 'stopwatch') {
                     playStopwatchSound();
                 }
             }
 
-            // Play music based on environment
-            const stateForMusic = gameEngine.get_state().toJs({dict_converter: Object.fromEntries});
-            playMusic(stateForMusic.score);
+            // Play music based on environment (the sequencer counts 60Hz steps)
+            for (let i = 0; i < tick.steps; i++) {
+                playMusic(tick.score);
+            }
 
-            // Render game
-            renderGame();
-        } else if (gameState === 'gameover') {
-            renderGameOver();
-        } else if (gameState === 'highscore') {
-            renderHighScoreEntry();
+            // Draw HUD over the frame
+            renderHUD(tick);
+            if (perfOverlay) {
+                renderPerfOverlay();
+            }
+        } else {
+            // Menus animate on a fixed 60Hz frame counter
+            accumulator += Math.min(deltaTime, 100); // Cap at 100ms to prevent spiral
+            let updated = false;
+            while (accumulator >= FRAME_TIME) {
+                frame++;
+                accumulator -= FRAME_TIME;
+                updated = true;
+            }
+
+            if (updated) {
+                if (gameState === 'intro') {
+                    renderIntro();
+                    playMusic(0);
+                } else if (gameState === 'gameover') {
+                    renderGameOver();
+                } else if (gameState === 'highscore') {
+                    renderHighScoreEntry();
+                }
+                if (!startupReport.first_frame) {
+                    finishStartupReport();
+                }
+            }
         }
 
         animationId = requestAnimationFrame(gameLoop);
@@ -634,76 +926,45 @@ const DEPTH_Y_OFFSET = {
     2: 0
 };
 
-function renderGame() {
-    // Clear screen
-    ctx.fillStyle = BLACK;
-    ctx.fillRect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT);
-
-    // Get screen buffer from Python engine
-    const bufferProxy = gameEngine.get_screen_buffer();
-    const buffer = bufferProxy.toJs();
-
-    // Draw buffer with depth-based font sizes
-    for (let y = 0; y < buffer.length; y++) {
-        const row = buffer[y];
-        for (let x = 0; x < row.length; x++) {
-            const cell = row[x];
-            // Handle both array and proxy access
-            const char = cell[0] || cell.get(0);
-            const color = cell[1] || cell.get(1);
-            const depth = (cell[2] !== undefined ? cell[2] : (cell.get ? cell.get(2) : 2)) || 2;
-
-            if (char && char !== ' ') {
-                ctx.font = DEPTH_FONTS[depth] || DEPTH_FONTS[2];
-                ctx.fillStyle = colorToCSS(color);
-                const yPos = y * CHAR_HEIGHT + (DEPTH_Y_OFFSET[depth] || 0);
-                ctx.fillText(char, x * CHAR_WIDTH, yPos);
-            }
-        }
-    }
-
+function renderHUD(state) {
     // Reset font to default for HUD
     ctx.font = '14px Consolas, "Courier New", monospace';
 
-    // Draw HUD
-    const stateProxy = gameEngine.get_state();
-    const state = stateProxy.toJs({dict_converter: Object.fromEntries});
-
     // Score
     ctx.fillStyle = YELLOW;
     ctx.fillText(`Score: ${state.score}`, SCREEN_WIDTH - 120, 5);
 
     // Jumps with asterisks
-    const jumpsLeft = state.player.jumps_left;
-    const maxJumps = state.player.jetpack_jumps > 0 ? 2 : 1;
+    const jumpsLeft = state.jumps_left;
+    const maxJumps = state.jetpack_jumps > 0 ? 2 : 1;
     ctx.fillStyle = WHITE;
     ctx.fillText(`Jumps: ${'*'.repeat(jumpsLeft)}${'-'.repeat(maxJumps - jumpsLeft)}`, SCREEN_WIDTH - 120, 23);
 
     // Power-up indicators
     let yOffset = 5;
 
-    if (state.player.ammo > 0) {
+    if (state.ammo > 0) {
         ctx.fillStyle = ORANGE;
-        ctx.fillText(`[=> x${state.player.ammo}`, 10, yOffset);
+        ctx.fillText(`[=> x${state.ammo}`, 10, yOffset);
         yOffset += 18;
     }
 
-    if (state.player.jetpack_jumps > 0) {
+    if (state.jetpack_jumps > 0) {
         ctx.fillStyle = CYAN;
-        ctx.fillText(`<J> x${state.player.jetpack_jumps}`, 10, yOffset);
+        ctx.fillText(`<J> x${state.jetpack_jumps}`, 10, yOffset);
         yOffset += 18;
     }
 
-    if (state.player.has_beans) {
-        const secs = Math.floor(state.player.beans_timer / 60);
+    if (state.has_beans) {
+        const secs = Math.floor(state.beans_timer / 60);
         ctx.fillStyle = LIME;
         ctx.fillText(`{B} ${secs}s`, 10, yOffset);
         yOffset += 18;
     }
 
-    if (state.player.acid_timer > 0) {
-        const secs = Math.floor(state.player.acid_timer / 60);
-        const acidLevel = state.player.acid_level;
+    if (state.acid_timer > 0) {
+        const secs = Math.floor(state.acid_timer / 60);
+        const acidLevel = state.acid_level;
 
         if (acidLevel === 3) {
             ctx.fillStyle = PSYCHEDELIC_COLORS[Math.floor(frame / 5) % PSYCHEDELIC_COLORS.length];
@@ -726,8 +987,8 @@ function renderGame() {
     }
 
     // Grace period indicator (post-nirvana invulnerability)
-    if (state.player.grace_period > 0) {
-        const secs = (state.player.grace_period / 60).toFixed(1);
+    if (state.grace_period > 0) {
+        const secs = (state.grace_period / 60).toFixed(1);
         // Flashing effect
         if (Math.floor(frame / 4) % 2 === 0) {
             ctx.fillStyle = WHITE;
@@ -737,40 +998,16 @@ function renderGame() {
 }
 
 function renderGameOver() {
-    // Clear screen
-    ctx.fillStyle = BLACK;
-    ctx.fillRect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT);
-
-    // Get game over buffer from Python engine
-    const bufferProxy = gameEngine.get_game_over_buffer();
-    const buffer = bufferProxy.toJs();
-
-    // Draw buffer with depth-based font sizes
-    for (let y = 0; y < buffer.length; y++) {
-        const row = buffer[y];
-        for (let x = 0; x < row.length; x++) {
-            const cell = row[x];
-            // Handle both array and proxy access
-            const char = cell[0] || cell.get(0);
-            const color = cell[1] || cell.get(1);
-            const depth = (cell[2] !== undefined ? cell[2] : (cell.get ? cell.get(2) : 2)) || 2;
-
-            if (char && char !== ' ') {
-                ctx.font = DEPTH_FONTS[depth] || DEPTH_FONTS[2];
-                ctx.fillStyle = colorToCSS(color);
-                const yPos = y * CHAR_HEIGHT + (DEPTH_Y_OFFSET[depth] || 0);
-                ctx.fillText(char, x * CHAR_WIDTH, yPos);
-            }
-        }
-    }
+    // Get packed game over buffer from Python engine
+    drawPackedProxy(gameEngine.get_packed_game_over_buffer());
 }
 
 function renderHighScoreEntry() {
     ctx.fillStyle = BLACK;
     ctx.fillRect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT);
 
-    const stateProxy = gameEngine.get_state();
-    const state = stateProxy.toJs({dict_converter: Object.fromEntries});
+    // Score of the run that just ended, from its last tick
+    const state = tickState;
 
     // Title
     ctx.fillStyle = YELLOW;
@@ -0,0 +1,238 @@
+# ASCII Runner - Session Host
+# Runs many headless GameEngine sessions in one asyncio process for server-side
+# play: authoritative scoring, bots and spectated games. All sessions advance
+# together on one shared 60Hz tick; inputs arrive through the host's inbox
+# queue and are applied before the session's next frame. Sessions end on game
+# over, when closed, when idle for too long or when they outgrow their memory
+# budget.
+#
+#   python session_host.py --sessions 2000 --seconds 10   # bot load test, prints metrics
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+
+from game_engine import (
+    SIM_DT, BLANK_FRAME, TICK_HEADER, GameEngine, PhaseProfiler,
+)
+
+MAX_SESSIONS = 10000
+IDLE_TIMEOUT = 60.0  # Seconds without input before a session is evicted
+SESSION_MEMORY_BUDGET = 256 * 1024  # Estimated bytes one session may hold
+EVICTION_INTERVAL = 60  # Ticks between idle / memory sweeps
+TICK_BATCH = 500  # Sessions stepped between yields to the event loop
+
+# Footprint estimate (see session_footprint), measured with tracemalloc on
+# CPython 3.11: a fresh headless engine, then what grows during play
+SESSION_BASE_BYTES = 13 * 1024
+REPLAY_INPUT_BYTES = 72  # One (frame, mask) tuple plus its list slot
+ENTITY_BYTES = 320  # An obstacle, powerup, bullet or background element, live or pooled
+RENDER_BUFFER_BYTES = 3 * len(BLANK_FRAME) + TICK_HEADER.size + len(BLANK_FRAME)
+
+END_REASONS = ("game_over", "closed", "idle", "memory")
+
+
+def session_footprint(engine):
+    """Estimated bytes held by one engine. The replay log is what grows without
+    bound - one record per input - so long sessions are what the budget catches."""
+    entities = sum(len(items) for items in engine.live_entities().values())
+    entities += sum(len(pool.free) for pool in engine.pools.values())
+    size = SESSION_BASE_BYTES + len(engine.replay.inputs) * REPLAY_INPUT_BYTES + entities * ENTITY_BYTES
+    if engine.framebuffer is not None:
+        size += RENDER_BUFFER_BYTES
+    return size
+
+
+class Session:
+    __slots__ = ("id", "engine", "render", "pending", "last_input", "ended")
+
+    def __init__(self, session_id, engine, render, now):
+        self.id = session_id
+        self.engine = engine
+        self.render = render  # Spectated: also run cosmetics so frames can be drawn
+        self.pending = 0  # INPUT_* flags for the next frame
+        self.last_input = now
+        self.ended = None  # End reason once the host dropped the session
+
+
+class SessionHost:
+    """Owns the sessions and the shared tick. Feed inputs with submit() or by
+    putting (session_id, mask) on inbox; on_end(session, reason) is called
+    once per session as it leaves."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, memory_budget=SESSION_MEMORY_BUDGET,
+                 idle_timeout=IDLE_TIMEOUT, on_end=None):
+        self.max_sessions = max_sessions
+        self.memory_budget = memory_budget
+        self.idle_timeout = idle_timeout
+        self.on_end = on_end
+        self.sessions = {}
+        self.inbox = asyncio.Queue()
+        self.ids = itertools.count(1)
+        self.running = False
+
+        self.ticks = 0
+        self.overruns = 0  # Ticks whose work took longer than SIM_DT
+        self.skipped_ticks = 0  # Ticks dropped after falling behind
+        self.sessions_per_tick = 0
+        self.max_sessions_per_tick = 0
+        self.opened = 0
+        self.ended = dict.fromkeys(END_REASONS, 0)
+        self.profiler = PhaseProfiler()
+
+    def open(self, seed=None, render=False):
+        """Starts a session and returns its id"""
+        if len(self.sessions) >= self.max_sessions:
+            raise RuntimeError("session host full (%d sessions)" % self.max_sessions)
+        session_id = next(self.ids)
+        self.sessions[session_id] = Session(session_id, GameEngine(seed), render, time.monotonic())
+        self.opened += 1
+        return session_id
+
+    def close(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is not None:
+            self.end(session, "closed")
+
+    def end(self, session, reason):
+        del self.sessions[session.id]
+        session.ended = reason
+        self.ended[reason] += 1
+        if self.on_end is not None:
+            self.on_end(session, reason)
+
+    def submit(self, session_id, mask):
+        """Queues an INPUT_* mask for a session's next frame"""
+        self.inbox.put_nowait((session_id, mask))
+
+    def drain_inbox(self):
+        inbox = self.inbox
+        sessions = self.sessions
+        now = time.monotonic()
+        while not inbox.empty():
+            session_id, mask = inbox.get_nowait()
+            session = sessions.get(session_id)
+            if session is not None:
+                session.pending |= mask
+                session.last_input = now
+
+    async def tick(self):
+        """Advances every session by one frame, yielding to the event loop every
+        TICK_BATCH sessions so socket handlers keep up"""
+        self.drain_inbox()
+        sessions = list(self.sessions.values())
+        for k, session in enumerate(sessions):
+            if k and k % TICK_BATCH == 0:
+                await asyncio.sleep(0)
+            if session.ended:
+                continue
+            engine = session.engine
+            if session.pending:
+                engine.apply_input(session.pending)
+                session.pending = 0
+            engine.simulate_frame(session.render)
+            if engine.game_over:
+                self.end(session, "game_over")
+
+        self.ticks += 1
+        self.sessions_per_tick = len(sessions)
+        self.max_sessions_per_tick = max(self.max_sessions_per_tick, len(sessions))
+        if self.ticks % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        now = time.monotonic()
+        for session in list(self.sessions.values()):
+            if now - session.last_input > self.idle_timeout:
+                self.end(session, "idle")
+            elif session_footprint(session.engine) > self.memory_budget:
+                self.end(session, "memory")
+
+    async def run(self):
+        """The shared fixed-tick scheduler; runs until stop(). A tick that starts
+        more than one period late drops the missed ticks instead of bursting,
+        so sessions slow down under overload rather than stutter."""
+        self.running = True
+        clock = time.monotonic
+        next_tick = clock()
+        while self.running:
+            delay = next_tick - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            started = clock()
+            await self.tick()
+            elapsed = clock() - started
+            self.profiler.record("tick", int(elapsed * 1e9))
+            if elapsed > SIM_DT:
+                self.overruns += 1
+            next_tick += SIM_DT
+            behind = clock() - next_tick
+            if behind > SIM_DT:
+                missed = int(behind / SIM_DT)
+                self.skipped_ticks += missed
+                next_tick += missed * SIM_DT
+
+    def stop(self):
+        self.running = False
+
+    def metrics(self):
+        tick_stats = self.profiler.stats().get("tick", {})
+        return {
+            "sessions": len(self.sessions),
+            "opened": self.opened,
+            "ended": dict(self.ended),
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped_ticks,
+            "sessions_per_tick": self.sessions_per_tick,
+            "max_sessions_per_tick": self.max_sessions_per_tick,
+            "tick_us": {name: tick_stats[name] for name in ("p50", "p95", "p99", "max")} if tick_stats else {},
+            "memory_estimate": sum(session_footprint(s.engine) for s in self.sessions.values()),
+        }
+
+
+async def load_test(sessions, seconds, seed=1):
+    """Keeps `sessions` bot games running for `seconds` and returns the metrics"""
+    from spectator_stream import bot_input
+
+    seeds = itertools.count(seed)
+    host = SessionHost(max_sessions=sessions)
+    for _ in range(sessions):
+        host.open(next(seeds))
+
+    async def bots():
+        while host.running:
+            for session in list(host.sessions.values()):
+                mask = bot_input(session.engine)
+                if mask:
+                    host.submit(session.id, mask)
+            # Replace finished games so the load stays constant
+            for _ in range(sessions - len(host.sessions)):
+                host.open(next(seeds))
+            await asyncio.sleep(SIM_DT)
+
+    scheduler = asyncio.create_task(host.run())
+    await asyncio.sleep(0)
+    bot_task = asyncio.create_task(bots())
+    await asyncio.sleep(seconds)
+    host.stop()
+    await scheduler
+    bot_task.cancel()
+    return host.metrics()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a bot load test on the session host")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(load_test(args.sessions, args.seconds, args.seed)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
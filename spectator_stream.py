@@ -0,0 +1,329 @@
+# ASCII Runner - Spectator Stream
+# Compact binary encoding of packed frames for broadcasting live runs. Every
+# KEYFRAME_INTERVAL frames (and whenever it is smaller) a frame goes out whole;
+# in between only its XOR against the previous frame, which is almost all
+# zeros. Either payload is run-length encoded, so the repetitive ground and
+# fill rows and the unchanged cells of a delta collapse to a few bytes.
+#
+#   python spectator_stream.py serve [--port 8765]   # bot plays, spectators watch
+#   python spectator_stream.py watch [--port 8765]   # draw a stream in this terminal
+#   python spectator_stream.py bench [--frames 3600] # bytes per frame vs JSON tuples
+#
+# Message: STREAM_HEADER (kind, frame number, payload length), then the payload.
+
+import argparse
+import asyncio
+import json
+import re
+import struct
+import sys
+import time
+
+from game_engine import BLANK_FRAME, SIM_DT, GameEngine, INPUT_JUMP, INPUT_FIRE
+
+KEYFRAME = ord("K")
+DELTA = ord("D")
+STREAM_HEADER = struct.Struct("<BIH")
+FRAME_SIZE = len(BLANK_FRAME)
+KEYFRAME_INTERVAL = 120  # Two seconds at 60Hz: the longest a corrupt or late join lasts
+KEYFRAME_CHECK_BYTES = FRAME_SIZE // 4  # Deltas larger than this are compared against a keyframe
+
+# Run-length code: a control byte below 0x80 is followed by that many + 1
+# literal bytes; from 0x80 up it repeats the next byte (control - 0x7D) times
+MAX_LITERAL = 0x80
+MIN_REPEAT = 3
+MAX_REPEAT = 0xFF - 0x7D
+REPEATS = re.compile(rb"(.)\1{%d,}" % (MIN_REPEAT - 1), re.S)
+
+DEFAULT_PORT = 8765
+MAX_CLIENT_BACKLOG = 64 * 1024  # Bytes queued for one spectator before it is resynced
+
+
+def rle_encode(data):
+    out = bytearray()
+
+    def literal(chunk):
+        for k in range(0, len(chunk), MAX_LITERAL):
+            part = chunk[k:k + MAX_LITERAL]
+            out.append(len(part) - 1)
+            out.extend(part)
+
+    pos = 0
+    for match in REPEATS.finditer(data):
+        start, end = match.span()
+        literal(data[pos:start])
+        run = end - start
+        while run >= MIN_REPEAT:
+            n = min(run, MAX_REPEAT)
+            out.append(n + 0x7D)
+            out.append(data[start])
+            run -= n
+        # A tail too short to repeat joins the next literal
+        pos = end - run
+    literal(data[pos:])
+    return bytes(out)
+
+
+def rle_decode(data, size=FRAME_SIZE):
+    out = bytearray()
+    pos = 0
+    n = len(data)
+    while pos < n:
+        control = data[pos]
+        if control < 0x80:
+            out += data[pos + 1:pos + control + 2]
+            pos += control + 2
+        else:
+            out += data[pos + 1:pos + 2] * (control - 0x7D)
+            pos += 2
+    if len(out) != size:
+        raise ValueError("corrupt spectator frame: %d bytes decoded, expected %d" % (len(out), size))
+    return out
+
+
+def pack_message(kind, number, payload):
+    return STREAM_HEADER.pack(kind, number, len(payload)) + payload
+
+
+def xor_bytes(a, b):
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+class FrameEncoder:
+    """Encodes a sequence of packed frames into spectator messages"""
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.prev = None
+        self.frame = 0
+        self.since_keyframe = 0
+        self.keyframes = 0
+        self.total_bytes = 0
+
+    def encode(self, frame):
+        """Returns the message for the next frame: a delta against the previous
+        one, or a keyframe when one is due or would be smaller"""
+        frame = bytes(frame)
+        number = self.frame
+        message = None
+        if self.prev is not None and self.since_keyframe < self.keyframe_interval:
+            message = pack_message(DELTA, number, rle_encode(xor_bytes(frame, self.prev)))
+        # A camera move shifts every row, and then the whole frame can be smaller
+        if message is None or len(message) > KEYFRAME_CHECK_BYTES:
+            key = pack_message(KEYFRAME, number, rle_encode(frame))
+            if message is None or len(key) < len(message):
+                message = key
+                self.since_keyframe = 0
+                self.keyframes += 1
+        self.since_keyframe += 1
+        self.prev = frame
+        self.frame += 1
+        self.total_bytes += len(message)
+        return message
+
+    def keyframe(self):
+        """A keyframe message for the last encoded frame - what a spectator
+        joining mid-stream needs before the next delta"""
+        return pack_message(KEYFRAME, self.frame - 1, rle_encode(self.prev))
+
+
+class FrameDecoder:
+    """Rebuilds packed frames from spectator messages"""
+
+    def __init__(self):
+        self.frame = None  # Packed frame after the last message
+        self.frame_number = -1
+
+    def decode(self, message):
+        """Applies one message (header and payload) and returns the packed frame"""
+        kind, number, length = STREAM_HEADER.unpack_from(message)
+        payload = message[STREAM_HEADER.size:STREAM_HEADER.size + length]
+        if len(payload) != length:
+            raise ValueError("truncated spectator message")
+        if kind == KEYFRAME:
+            self.frame = rle_decode(payload)
+        elif kind == DELTA:
+            if self.frame is None:
+                raise ValueError("delta before the first keyframe")
+            # A delta only applies to the frame right before it; a lost, late or
+            # repeated one would corrupt every frame until the next keyframe
+            if number != self.frame_number + 1:
+                raise ValueError("delta for frame %d after frame %d" % (number, self.frame_number))
+            self.frame = bytearray(xor_bytes(rle_decode(payload), self.frame))
+        else:
+            raise ValueError("unknown spectator message kind %r" % kind)
+        self.frame_number = number
+        return self.frame
+
+
+async def read_message(reader):
+    """Reads one whole message from an asyncio stream"""
+    header = await reader.readexactly(STREAM_HEADER.size)
+    _, _, length = STREAM_HEADER.unpack(header)
+    return header + await reader.readexactly(length)
+
+
+def bot_input(engine):
+    """Demo autopilot: jump and shoot when an obstacle is a few columns ahead"""
+    player = engine.player
+    for obs in engine.obstacles:
+        ahead = obs.x - (player.x + player.width)
+        if 0 <= ahead < 4 + engine.scroll_speed * 8:
+            return INPUT_FIRE | INPUT_JUMP
+        if ahead >= 0:
+            break
+    return 0
+
+
+class BotGame:
+    """A bot-played game that restarts itself, yielding one packed frame per 60Hz step"""
+
+    GAME_OVER_FRAMES = 120  # How long the game over screen stays up
+
+    def __init__(self, seed=None):
+        self.engine = GameEngine(seed)
+        self.game_over_frames = 0
+
+    def next_frame(self):
+        engine = self.engine
+        if engine.game_over:
+            self.game_over_frames += 1
+            if self.game_over_frames > self.GAME_OVER_FRAMES:
+                self.game_over_frames = 0
+                engine.reset()
+            else:
+                return engine.get_packed_game_over_buffer()
+        buf = engine.tick(bot_input(engine))
+        if engine.game_over:
+            return engine.get_packed_game_over_buffer()
+        return memoryview(buf)[len(buf) - FRAME_SIZE:]
+
+
+class SpectatorServer:
+    """Broadcasts one bot game to every connected spectator. Joining spectators
+    and ones whose socket backed up get a keyframe before the next delta."""
+
+    def __init__(self, seed=None, keyframe_interval=KEYFRAME_INTERVAL):
+        self.game = BotGame(seed)
+        self.encoder = FrameEncoder(keyframe_interval)
+        self.clients = {}  # writer -> needs a keyframe
+
+    async def handle(self, reader, writer):
+        self.clients[writer] = True
+        try:
+            # Spectators only listen; wait for them to hang up
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    def broadcast(self):
+        frame = self.game.next_frame()
+        message = self.encoder.encode(frame)
+        keyframe = None
+        for writer, resync in list(self.clients.items()):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                self.clients[writer] = True  # Skip frames until it catches up
+                continue
+            if resync:
+                if keyframe is None:
+                    keyframe = self.encoder.keyframe()
+                writer.write(keyframe)
+                self.clients[writer] = False
+            else:
+                writer.write(message)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        print("Spectator stream on %s:%d" % (host, port), file=sys.stderr)
+        async with server:
+            next_frame = time.monotonic()
+            while True:
+                self.broadcast()
+                next_frame += SIM_DT
+                await asyncio.sleep(max(0.0, next_frame - time.monotonic()))
+
+
+async def watch(host="127.0.0.1", port=DEFAULT_PORT):
+    """Draws a spectator stream in this terminal until the server hangs up"""
+    from terminal_runner import AnsiScreen, ENTER_SCREEN, LEAVE_SCREEN
+
+    reader, writer = await asyncio.open_connection(host, port)
+    decoder = FrameDecoder()
+    screen = AnsiScreen()
+    received = 0
+    out = sys.stdout.buffer
+    out.write(ENTER_SCREEN)
+    try:
+        while True:
+            message = await read_message(reader)
+            received += len(message)
+            try:
+                frame = decoder.decode(message)
+            except ValueError:
+                continue  # Out of step: wait for the next keyframe
+            out.write(screen.update(frame, "Spectating frame %d  %.0f B/frame" % (
+                decoder.frame_number, received / max(screen.frames + 1, 1))))
+            out.flush()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        out.write(LEAVE_SCREEN)
+        out.flush()
+        writer.close()
+
+
+def bench(frames, seed=1):
+    """Encodes a bot game and checks every frame round-trips. Returns sizes:
+    mean bytes per message and keyframe count, plus what get_screen_buffer()
+    as JSON would cost per frame (sampled)"""
+    game = BotGame(seed)
+    encoder = FrameEncoder()
+    decoder = FrameDecoder()
+    json_sizes = []
+    start = time.perf_counter()
+    for n in range(frames):
+        frame = game.next_frame()
+        if decoder.decode(encoder.encode(frame)) != frame:
+            raise AssertionError("frame %d did not round-trip" % n)
+        if n % 60 == 0:
+            engine = game.engine
+            tuples = engine.get_game_over_buffer() if engine.game_over else engine.get_screen_buffer()
+            json_sizes.append(len(json.dumps(tuples, separators=(",", ":"))))
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": frames,
+        "mean_bytes": encoder.total_bytes / frames,
+        "keyframes": encoder.keyframes,
+        "keyframe_bytes": len(encoder.keyframe()),
+        "json_bytes": sum(json_sizes) / len(json_sizes),
+        "codec_us_per_frame": elapsed / frames * 1e6,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Broadcast or watch ASCII Runner games")
+    parser.add_argument("mode", choices=("serve", "watch", "bench"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--frames", type=int, default=3600, help="frames to encode in bench mode")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mode == "serve":
+            asyncio.run(SpectatorServer(args.seed).serve(args.host, args.port))
+        elif args.mode == "watch":
+            asyncio.run(watch(args.host, args.port))
+        else:
+            print(json.dumps(bench(args.frames, 1 if args.seed is None else args.seed), indent=2))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+# ASCII Runner - Terminal Frontend
+# Plays the game in an ANSI terminal (kiosk boxes, SSH, tmux) on the same
+# game_engine.py the browser loads. Each frame rewrites only the cells that
+# changed since the last one, a run of cells in the same color costs a single
+# SGR sequence, and the whole update goes out in one write.
+#
+#   python terminal_runner.py [--seed N] [--fps 60] [--colors 256] [--stats]
+#   python terminal_runner.py --dry-run 3600    # headless: report bytes per frame
+#
+# Controls: SPACE jump & shoot (restart after game over), ESC or q quits.
+# Needs an 80x26 terminal and a POSIX tty.
+
+import argparse
+import os
+import select
+import sys
+import time
+
+from game_engine import (
+    SCREEN_COLS, SCREEN_ROWS, COLOR_PLANE, DEPTH_PLANE, BLANK_FRAME, PALETTE, PALETTE_INDEX, WHITE, PERF_PERCENTILES,
+    INPUT_JUMP, INPUT_FIRE, TICK_FIELDS, TICK_HEADER, TICK_GAME_OVER, GameEngine,
+)
+
+STATUS_ROW = SCREEN_ROWS  # 0-based row of the status line under the playfield
+STATUS_REFRESH_FRAMES = 30
+STATS_WINDOW = 600  # Frames of byte counts kept for the stats line and summary
+MAX_SKIP_REWRITE = 4  # Rewrite up to this many unchanged cells rather than move the cursor
+ESC_TIMEOUT = 0.05  # Seconds an ESC may wait for the rest of an escape sequence
+
+# Far layers are dimmed so parallax still reads without per-depth font sizes
+DEPTH_SHADE = (0.6, 0.8, 1.0)
+
+ENTER_SCREEN = b"\x1b[?1049h\x1b[?25l\x1b[48;2;0;0;0m\x1b[2J"
+LEAVE_SCREEN = b"\x1b[0m\x1b[2J\x1b[?25h\x1b[?1049l"
+CLEAR = b"\x1b[2J"
+
+
+def rgb_to_256(r, g, b):
+    """Nearest xterm-256 color: the 6x6x6 cube or the gray ramp"""
+    if r == g == b:
+        if r < 8:
+            return 16
+        if r > 248:
+            return 231
+        return 232 + (r - 8) * 24 // 247
+    return 16 + 36 * round(r / 255 * 5) + 6 * round(g / 255 * 5) + round(b / 255 * 5)
+
+
+def build_sgr(colors):
+    """Foreground SGR sequence per (depth, palette index), flattened as
+    depth * len(PALETTE) + index"""
+    sgr = []
+    for shade in DEPTH_SHADE:
+        for r, g, b in PALETTE:
+            r, g, b = int(r * shade), int(g * shade), int(b * shade)
+            if colors == 256:
+                sgr.append(b"\x1b[38;5;%dm" % rgb_to_256(r, g, b))
+            else:
+                sgr.append(b"\x1b[38;2;%d;%d;%dm" % (r, g, b))
+    return sgr
+
+
+class AnsiScreen:
+    """Turns packed frames into the smallest ANSI update against what the
+    terminal currently shows, and counts the bytes each frame costs"""
+
+    def __init__(self, colors=24):
+        self.sgr = build_sgr(colors)
+        # Full-brightness white, from the same table so --colors 256 applies
+        self.status_sgr = self.sgr[(len(DEPTH_SHADE) - 1) * len(PALETTE) + PALETTE_INDEX[WHITE]]
+        self.shown = None  # Packed frame on the terminal; None redraws everything
+        self.status = None
+        self.frames = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self.recent = [0] * STATS_WINDOW
+
+    def invalidate(self):
+        self.shown = None
+        self.status = None
+
+    def update(self, frame, status=None):
+        """Returns the bytes that bring the terminal from the shown frame to
+        frame (plus the status line when its text changed)"""
+        out = bytearray()
+        if self.shown is None:
+            out += CLEAR
+            prev = BLANK_FRAME
+        else:
+            prev = self.shown
+        sgr = self.sgr
+        ncolors = len(PALETTE)
+        pen = -1  # Index into sgr of the current foreground
+        cursor_y = cursor_x = -1  # Where the next written glyph lands
+
+        for y in range(SCREEN_ROWS):
+            i = y * SCREEN_COLS
+            j = i + SCREEN_COLS
+            glyphs = frame[i:j]
+            colors = frame[COLOR_PLANE + i:COLOR_PLANE + j]
+            depths = frame[DEPTH_PLANE + i:DEPTH_PLANE + j]
+            old_glyphs = prev[i:j]
+            old_colors = prev[COLOR_PLANE + i:COLOR_PLANE + j]
+            old_depths = prev[DEPTH_PLANE + i:DEPTH_PLANE + j]
+            if glyphs == old_glyphs and colors == old_colors and depths == old_depths:
+                continue
+
+            for x in range(SCREEN_COLS):
+                glyph = glyphs[x]
+                # A blank looks the same whatever its color
+                if glyph == old_glyphs[x] and (glyph == 32 or (colors[x] == old_colors[x] and
+                                                               depths[x] == old_depths[x])):
+                    continue
+
+                if cursor_y != y:
+                    out += b"\x1b[%d;%dH" % (y + 1, x + 1)
+                elif cursor_x != x:
+                    # Short gaps are cheaper to rewrite when no color change is needed
+                    gap = range(cursor_x, x)
+                    if len(gap) <= MAX_SKIP_REWRITE and all(
+                            glyphs[k] == 32 or depths[k] * ncolors + colors[k] == pen for k in gap):
+                        out += glyphs[cursor_x:x]
+                    else:
+                        out += b"\x1b[%dC" % len(gap)
+
+                if glyph != 32:
+                    key = depths[x] * ncolors + colors[x]
+                    if key != pen:
+                        out += sgr[key]
+                        pen = key
+                out.append(glyph)
+                cursor_y, cursor_x = y, x + 1
+
+        if status is not None and status != self.status:
+            self.status = status
+            out += b"\x1b[%d;1H" % (STATUS_ROW + 1) + self.status_sgr
+            out += status.ljust(SCREEN_COLS)[:SCREEN_COLS].encode("ascii")
+
+        self.shown = bytes(frame)
+        n = len(out)
+        self.recent[self.frames % STATS_WINDOW] = n
+        self.frames += 1
+        self.total_bytes += n
+        self.max_bytes = max(self.max_bytes, n)
+        return out
+
+    def stats(self):
+        """Bytes per frame: mean and max overall, p50/p95/p99 over the last STATS_WINDOW frames"""
+        recent = sorted(self.recent[:min(self.frames, STATS_WINDOW)]) or [0]
+        k = len(recent)
+        stats = {"frames": self.frames, "mean": self.total_bytes / max(self.frames, 1), "max": self.max_bytes}
+        for name, q in PERF_PERCENTILES:
+            stats[name] = recent[min(k - 1, int(k * q))]
+        return stats
+
+
+def parse_keys(data):
+    """Returns (pressed, quit, rest) for a chunk of tty input. Escape sequences
+    (arrow keys and the like) are skipped; one cut off at the end of data -
+    including a trailing ESC, which may yet start one - is returned as rest
+    to be parsed with the next read."""
+    pressed = quit = False
+    k = 0
+    n = len(data)
+    while k < n:
+        key = data[k]
+        if key == 0x1b:
+            if k + 1 == n:
+                return pressed, quit, data[k:]
+            if data[k + 1] in b"[O":
+                # CSI / SS3 sequence: skip to its final byte
+                start = k
+                k += 2
+                while k < n and not 0x40 <= data[k] <= 0x7e:
+                    k += 1
+                if k == n:
+                    return pressed, quit, data[start:]
+            else:
+                quit = True
+        elif key in b"qQ\x03":
+            quit = True
+        elif key == 0x20:
+            pressed = True
+        k += 1
+    return pressed, quit, b""
+
+
+class KeyReader:
+    """Reads the keys waiting on a tty. A sequence split across reads is held
+    until the next one; an ESC nothing follows within ESC_TIMEOUT quits."""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.pending = b""
+        self.pending_since = 0.0
+
+    def read(self):
+        """Returns (pressed, quit) for everything waiting on the tty"""
+        data = self.pending
+        while select.select([self.fd], [], [], 0)[0]:
+            chunk = os.read(self.fd, 64)
+            if not chunk:
+                return False, True
+            data += chunk
+        pressed, quit, rest = parse_keys(data)
+        now = time.monotonic()
+        if rest and rest == self.pending:
+            if now - self.pending_since >= ESC_TIMEOUT:
+                # Nothing more came: a lone ESC quits, a broken sequence is dropped
+                quit = quit or rest == b"\x1b"
+                rest = b""
+        elif rest:
+            self.pending_since = now
+        self.pending = rest
+        return pressed, quit
+
+
+def status_text(tick, screen, show_stats):
+    text = "Score %d  High %d" % (tick["score"], tick["high_score"])
+    if tick["ammo"]:
+        text += "  Ammo %d" % tick["ammo"]
+    if tick["jetpack_jumps"]:
+        text += "  Jet %d" % tick["jetpack_jumps"]
+    if tick["acid_timer"]:
+        text += "  Acid %ds" % (tick["acid_timer"] // 60)
+    if show_stats:
+        stats = screen.stats()
+        text += "  | %d B/frame p95 %d" % (stats["mean"], stats["p95"])
+    return text
+
+
+class Game:
+    """The play / game over loop around one GameEngine, shared by the tty and
+    dry-run front ends. frame() returns the bytes to write."""
+
+    def __init__(self, seed=None, colors=24, show_stats=False):
+        self.engine = GameEngine(seed)
+        self.screen = AnsiScreen(colors)
+        self.show_stats = show_stats
+        self.playing = True
+        self.tick = dict.fromkeys(TICK_FIELDS, 0)
+        self.status = ""
+
+    def frame(self, pressed, dt_seconds):
+        engine = self.engine
+        if not self.playing and pressed:
+            # The restart press doesn't also jump in the new game
+            engine.reset()
+            self.playing = True
+            pressed = False
+        if self.playing:
+            buf = engine.tick(INPUT_FIRE | INPUT_JUMP if pressed else 0, dt_seconds)
+            self.tick.update(zip(TICK_FIELDS, TICK_HEADER.unpack_from(buf)))
+            frame = memoryview(buf)[TICK_HEADER.size:]
+            if self.tick["events"] & TICK_GAME_OVER:
+                self.playing = False
+        else:
+            frame = engine.get_packed_game_over_buffer()
+
+        if self.screen.frames % STATUS_REFRESH_FRAMES == 0 or not self.show_stats:
+            self.status = status_text(self.tick, self.screen, self.show_stats)
+        return self.screen.update(frame, self.status)
+
+
+def run_tty(game, fps):
+    import termios
+    import tty
+
+    cols, rows = os.get_terminal_size()
+    if cols < SCREEN_COLS or rows < SCREEN_ROWS + 1:
+        print("Terminal is %dx%d; ASCII Runner needs %dx%d" % (cols, rows, SCREEN_COLS, SCREEN_ROWS + 1),
+              file=sys.stderr)
+        return 1
+
+    fd = sys.stdin.fileno()
+    out = sys.stdout.buffer
+    saved = termios.tcgetattr(fd)
+    keys = KeyReader(fd)
+    frame_time = 1 / fps
+    try:
+        tty.setraw(fd)
+        out.write(ENTER_SCREEN)
+        last = next_frame = time.monotonic()
+        while True:
+            pressed, quit = keys.read()
+            if quit:
+                break
+            now = time.monotonic()
+            out.write(game.frame(pressed, now - last))
+            out.flush()
+            last = now
+            next_frame += frame_time
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.monotonic()  # Fell behind: don't try to catch up
+    finally:
+        out.write(LEAVE_SCREEN)
+        out.flush()
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+    return 0
+
+
+def run_dry(game, frames, fps):
+    """Plays frames headlessly, pressing space every half second, and discards the output"""
+    for n in range(frames):
+        game.frame(n % max(1, fps // 2) == 0, 1 / fps)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play ASCII Runner in an ANSI terminal")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--fps", type=int, default=60, help="display frames per second (the game always steps at 60Hz)")
+    parser.add_argument("--colors", type=int, choices=(24, 256), default=24,
+                        help="24-bit color, or the xterm 256-color palette for terminals without it")
+    parser.add_argument("--stats", action="store_true", help="show bytes per frame in the status line")
+    parser.add_argument("--dry-run", type=int, metavar="FRAMES", help="play FRAMES frames without a terminal")
+    args = parser.parse_args(argv)
+    if args.fps < 1:
+        parser.error("--fps must be at least 1")
+
+    game = Game(args.seed, args.colors, args.stats)
+    if args.dry_run:
+        status = run_dry(game, args.dry_run, args.fps)
+    else:
+        status = run_tty(game, args.fps)
+
+    stats = game.screen.stats()
+    print("%d frames, bytes per frame: mean %.0f p50 %d p95 %d p99 %d max %d (%.1f KB/s at %d fps)" % (
+        stats["frames"], stats["mean"], stats["p50"], stats["p95"], stats["p99"], stats["max"],
+        stats["mean"] * args.fps / 1024, args.fps))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
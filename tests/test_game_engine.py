@@ -0,0 +1,71 @@
+import pytest
+
+from game_engine import GameEngine, Replay, MAX_SEED, INPUT_JUMP, INPUT_FIRE
+
+
+def play(engine, frames, period):
+    for _ in range(frames):
+        if engine.game_over:
+            break
+        if engine.frame % period == 0:
+            engine.apply_input(INPUT_JUMP | INPUT_FIRE)
+        engine.simulate_frame(False)
+
+
+def test_restore_branch_then_rewind_keeps_replay_valid():
+    for seed in range(40):
+        engine = GameEngine(seed)
+        play(engine, 60, 23)
+        root = engine.snapshot()
+        play(engine, 120, 29)
+        child = engine.snapshot()
+        child_frame, child_score = engine.frame, engine.score
+
+        engine.restore(root)
+        play(engine, 200, 17)
+        engine.restore(child)
+        assert (engine.frame, engine.score) == (child_frame, child_score)
+        play(engine, 300, 31)
+
+        outcome = engine.get_replay().verify()
+        assert outcome["valid"], (seed, outcome)
+
+        # Same as never having branched
+        straight = GameEngine(seed)
+        play(straight, 60, 23)
+        play(straight, 120, 29)
+        play(straight, 300, 31)
+        assert engine.get_replay().to_bytes() == straight.get_replay().to_bytes()
+
+
+def test_restore_brings_back_high_score():
+    engine = GameEngine(1)
+    snap = engine.snapshot()
+    play(engine, 10000, 1000)
+    assert engine.game_over and engine.high_score > 0
+    engine.restore(snap)
+    assert engine.high_score == 0 and not engine.game_over
+
+
+def test_truncated_replay_raises_value_error():
+    engine = GameEngine(3)
+    play(engine, 600, 20)
+    data = engine.get_replay().to_bytes()
+    assert Replay.from_bytes(data).inputs == engine.replay.inputs
+    for size in (0, 5, len(data) - 1):
+        with pytest.raises(ValueError, match="corrupt replay"):
+            Replay.from_bytes(data[:size])
+    with pytest.raises(ValueError):
+        Replay.from_string("not base64!")
+
+
+def test_seed_out_of_replay_range_is_rejected():
+    for seed in (-1, MAX_SEED + 1):
+        with pytest.raises(ValueError):
+            GameEngine(seed)
+
+    engine = GameEngine(MAX_SEED)
+    play(engine, 400, 25)
+    replay = Replay.from_bytes(engine.get_replay().to_bytes())
+    assert replay.seed == MAX_SEED
+    assert replay.verify()["valid"]
@@ -0,0 +1,40 @@
+import pytest
+
+from game_engine import GameEngine
+from spectator_stream import FrameDecoder, FrameEncoder
+
+
+def encoded_frames(n):
+    engine = GameEngine(7)
+    encoder = FrameEncoder()
+    frames, messages = [], []
+    for _ in range(n):
+        frame = bytes(engine.get_packed_screen_buffer())
+        frames.append(frame)
+        messages.append(encoder.encode(frame))
+        engine.update()
+    return frames, messages
+
+
+def test_decoder_rejects_skipped_and_repeated_deltas():
+    frames, messages = encoded_frames(4)
+
+    decoder = FrameDecoder()
+    assert decoder.decode(messages[0]) == frames[0]
+    with pytest.raises(ValueError):
+        decoder.decode(messages[2])  # Skips frame 1
+    assert decoder.decode(messages[1]) == frames[1]
+    with pytest.raises(ValueError):
+        decoder.decode(messages[1])  # Repeated
+    assert decoder.decode(messages[2]) == frames[2]
+
+
+def test_decoder_resyncs_on_keyframe():
+    frames, messages = encoded_frames(3)
+    decoder = FrameDecoder()
+    with pytest.raises(ValueError):
+        decoder.decode(messages[1])
+    encoder = FrameEncoder()
+    for frame in frames:
+        encoder.encode(frame)
+    assert decoder.decode(encoder.keyframe()) == frames[2]
@@ -0,0 +1,29 @@
+import os
+import time
+
+from terminal_runner import ESC_TIMEOUT, KeyReader, parse_keys
+
+
+def test_parse_keys_holds_a_split_escape_sequence():
+    assert parse_keys(b" \x1b") == (True, False, b"\x1b")
+    assert parse_keys(b"\x1b[") == (False, False, b"\x1b[")
+    assert parse_keys(b"\x1b[A ") == (True, False, b"")
+    assert parse_keys(b"q") == (False, True, b"")
+
+
+def test_key_reader_joins_reads_and_times_out_a_lone_esc():
+    r, w = os.pipe()
+    try:
+        keys = KeyReader(r)
+        os.write(w, b"\x1b")
+        assert keys.read() == (False, False)
+        os.write(w, b"[C")  # Rest of an arrow key
+        assert keys.read() == (False, False)
+
+        os.write(w, b"\x1b")
+        assert keys.read() == (False, False)
+        time.sleep(ESC_TIMEOUT * 2)
+        assert keys.read() == (False, True)
+    finally:
+        os.close(r)
+        os.close(w)
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from tournament import MAX_FRAMES, load_results, main, run_tournament
+
+
+def test_resume_after_truncated_record(tmp_path):
+    output = tmp_path / "results.jsonl"
+    seeds = range(1, 5)
+    run_tournament(["idle"], seeds, str(output), workers=1, chunk_size=2)
+
+    # Kill mid-write: the last record is cut off
+    data = output.read_bytes()
+    output.write_bytes(data[:-10])
+    assert len(load_results(str(output))) == 3
+
+    for _ in range(2):
+        runs, stats = run_tournament(["idle"], seeds, str(output), workers=1, chunk_size=2)
+        lines = output.read_text().splitlines()
+        assert all(json.loads(line) for line in lines)
+        assert len(lines) == 4
+    assert stats["played"] == 0 and stats["resumed"] == 4
+    assert [run["seed"] for run in runs] == list(seeds)
+
+
+def test_resume_replays_runs_capped_at_another_max_frames(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    run_tournament(["idle"], range(1, 3), output, workers=1, max_frames=50)
+    runs, stats = run_tournament(["idle"], range(1, 3), output, workers=1)
+    assert stats["played"] == 2
+    assert all(run["max_frames"] == MAX_FRAMES and run["death"] for run in runs)
+    runs, stats = run_tournament(["idle"], range(1, 3), output, workers=1, max_frames=50)
+    assert stats["played"] == 0
+    assert all(run["frames"] == 50 and run["death"] is None for run in runs)
+
+
+def test_cli_rejects_empty_seeds_and_chunks(tmp_path):
+    for flag in ("--seeds", "--chunk"):
+        with pytest.raises(SystemExit):
+            main([flag, "0", "-o", str(tmp_path / "results.jsonl")])
@@ -0,0 +1,202 @@
+# ASCII Runner - Tournament Runner
+# Plays every seed with every autopilot policy on a process pool and reports
+# score distributions and what killed each policy. Jobs go to the workers in
+# chunks and each run comes back as one small tuple, so nothing crosses a
+# process boundary per frame and throughput grows with the number of cores.
+#
+#   python tournament.py --seeds 1000 -o results.jsonl         # all policies, JSON summary to stdout
+#   python tournament.py --seeds 1000 -o results.jsonl         # again: only runs missing from the file
+#   python tournament.py -p reactive -p random --seeds 200 -j 4
+#
+# Results file: one JSON object per finished run (policy, seed, max_frames,
+# score, frames, death). It is appended to as chunks finish, so an interrupted
+# tournament picks up where it stopped. Runs capped at a different --max-frames
+# don't count as done.
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game_engine import GameEngine, INPUT_JUMP, INPUT_FIRE, PERF_PERCENTILES
+
+MAX_FRAMES = 60 * 60 * 10  # Runs still alive after ten minutes of game time are stopped
+CHUNK_SIZE = 16  # Runs per task sent to a worker
+RANDOM_PRESS_CHANCE = 0.05
+SURVIVED = "survived"  # Death key for runs that reached the frame cap
+
+
+# A policy factory takes the run's seed and returns policy(engine) -> INPUT_*
+# mask, called before every frame. Workers look policies up by name.
+
+def idle_policy(seed):
+    def policy(engine):
+        return 0
+    return policy
+
+
+def random_policy(seed):
+    # Own stream, so the presses don't depend on the game's draws
+    rng = random.Random("policy:%d" % seed)
+
+    def policy(engine):
+        return INPUT_FIRE | INPUT_JUMP if rng.random() < RANDOM_PRESS_CHANCE else 0
+    return policy
+
+
+def reactive_policy(seed):
+    from spectator_stream import bot_input
+    return bot_input
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "random": random_policy,
+    "reactive": reactive_policy,
+}
+
+
+def play(policy_name, seed, max_frames=MAX_FRAMES):
+    """One headless run. Returns (policy, seed, score, frames, death type or None)."""
+    engine = GameEngine(seed)
+    policy = POLICIES[policy_name](seed)
+    apply_input = engine.apply_input
+    simulate_frame = engine.simulate_frame
+    for _ in range(max_frames):
+        mask = policy(engine)
+        if mask:
+            apply_input(mask)
+        simulate_frame(False)
+        if engine.game_over:
+            break
+    return (policy_name, seed, engine.score, engine.frame, engine.death_type)
+
+
+def run_chunk(jobs, max_frames=MAX_FRAMES):
+    """Worker entry point: plays a list of (policy, seed) jobs"""
+    return [play(policy_name, seed, max_frames) for policy_name, seed in jobs]
+
+
+def load_results(path):
+    """Runs already in a results file, keyed by (policy, seed, max_frames). A line cut off
+    by an interrupted write is ignored and that run is played again (see
+    drop_partial_line)."""
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path) as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue
+            results[(run["policy"], run["seed"], run.get("max_frames"))] = run
+    return results
+
+
+def drop_partial_line(path):
+    """Cuts a results file back to its last complete line, so runs appended
+    after an interrupted write start on a line of their own"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def summarize(runs):
+    """Distribution statistics for one policy's runs"""
+    scores = sorted(run["score"] for run in runs)
+    k = len(scores)
+    deaths = {}
+    for run in runs:
+        death = run["death"] or SURVIVED
+        deaths[death] = deaths.get(death, 0) + 1
+    summary = {
+        "runs": k,
+        "mean": sum(scores) / k,
+        "min": scores[0],
+        "max": scores[-1],
+    }
+    for name, q in PERF_PERCENTILES:
+        summary[name] = scores[min(k - 1, int(k * q))]
+    summary["mean_frames"] = sum(run["frames"] for run in runs) / k
+    summary["deaths"] = dict(sorted(deaths.items(), key=lambda item: -item[1]))
+    return summary
+
+
+def run_tournament(policies, seeds, output, workers=None, chunk_size=CHUNK_SIZE, max_frames=MAX_FRAMES):
+    """Plays every (policy, seed) pair missing from output at this max_frames,
+    appending each run as it comes back. Returns (results for the requested
+    pairs, stats)."""
+    drop_partial_line(output)
+    results = load_results(output)
+    jobs = [(name, seed) for name in policies for seed in seeds if (name, seed, max_frames) not in results]
+    chunks = [jobs[k:k + chunk_size] for k in range(0, len(jobs), chunk_size)]
+
+    start = time.perf_counter()
+    frames = 0
+    if chunks:
+        with open(output, "a") as f, ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(run_chunk, chunk, max_frames) for chunk in chunks]
+            for future in as_completed(futures):
+                for name, seed, score, run_frames, death in future.result():
+                    run = {"policy": name, "seed": seed, "max_frames": max_frames,
+                           "score": score, "frames": run_frames, "death": death}
+                    results[(name, seed, max_frames)] = run
+                    f.write(json.dumps(run) + "\n")
+                    frames += run_frames
+                f.flush()
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        "played": len(jobs),
+        "resumed": len(policies) * len(seeds) - len(jobs),
+        "workers": workers or os.cpu_count(),
+        "seconds": elapsed,
+        "frames_per_second": frames / elapsed if elapsed else 0.0,
+    }
+    wanted = [results[(name, seed, max_frames)] for name in policies for seed in seeds]
+    return wanted, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play seeds x autopilot policies across all cores")
+    parser.add_argument("-p", "--policy", action="append", choices=list(POLICIES),
+                        help="policy to play (repeatable, default: all)")
+    parser.add_argument("--seeds", type=int, default=100, help="number of seeds per policy")
+    parser.add_argument("--first-seed", type=int, default=1)
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="runs per worker task")
+    parser.add_argument("--max-frames", type=int, default=MAX_FRAMES, help="stop runs that last this long")
+    parser.add_argument("-o", "--output", default="tournament.jsonl",
+                        help="results file; runs already in it are not played again")
+    args = parser.parse_args(argv)
+    for name in ("seeds", "chunk", "max_frames", "workers"):
+        value = getattr(args, name)
+        if value is not None and value < 1:
+            parser.error("--%s must be at least 1" % name.replace("_", "-"))
+
+    policies = args.policy or list(POLICIES)
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    try:
+        runs, stats = run_tournament(policies, seeds, args.output, args.workers, args.chunk, args.max_frames)
+    except KeyboardInterrupt:
+        print("Interrupted; finished runs are in %s" % args.output, file=sys.stderr)
+        return 130
+
+    summary = {
+        "stats": stats,
+        "policies": {name: summarize([run for run in runs if run["policy"] == name]) for name in policies},
+    }
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())